@@ -1,6 +1,6 @@
 #src/alerts/masters_navigation_audit.py
 """Master's Navigation Audit Alert Implementation.""" 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd 
 from datetime import datetime, timedelta 
 from zoneinfo import ZoneInfo
@@ -18,6 +18,26 @@ logger = logging.getLogger(__name__)
 class MastersNavigationAuditAlert(BaseAlert):
     """Alert for Master's Navigation Audit"""
 
+    # Columns the SQL query must return (see get_required_columns)
+    REQUIRED_COLUMNS: Tuple[str, ...] = (
+        'crew_contract_id',
+        'crew_member_id',
+        'vessel_id',
+        'vsl_email',
+        'vessel',
+        'surname',
+        'full_name',
+        'rank',
+        'sign_on_date',
+        'due_date',
+    )
+
+    # Display format for each date column, applied once filtering is done
+    DATE_FORMATS: Dict[str, str] = {
+        'sign_on_date': '%Y-%m-%d %H:%M:%S',
+        'due_date': '%Y-%m-%d',
+    }
+
     def __init__(self, config: AlertConfig):
         """
         Initialise Master's Navigation Audit
@@ -108,26 +128,36 @@ class MastersNavigationAuditAlert(BaseAlert):
         # Filter for recent sync (timezone-aware) corresponding to config.lookback_days
         df_filtered = df[df['sign_on_date'] >= cutoff_date].copy()
 
-        # Format dates for display
-        df_filtered['sign_on_date'] = df_filtered['sign_on_date'].dt.strftime('%Y-%m-%d %H:%M:%S')
-
-        self._format_date_column(df_filtered, 'due_date')
+        # Format dates for display (one vectorised strftime per column)
+        for col, fmt in self.DATE_FORMATS.items():
+            self._format_date_column(df_filtered, col, fmt)
 
         self.logger.info(f"Filtered to {len(df_filtered)} entr{'y' if len(df_filtered)==1 else 'ies'} synced with LOOKBACK={self.lookback_days} day{'' if len(df_filtered)==1 else 's'}")
 
         return df_filtered
 
 
-    def _format_date_column(self, df: pd.DataFrame, col: str) -> None:
+    def _format_date_column(self, df: pd.DataFrame, col: str, fmt: str = '%Y-%m-%d') -> None:
         """
         Modifies the DataFrame in place
+
+        Unparseable or missing dates become empty strings.
         """
         if col in df.columns:
-            df[col] = (
-                pd.to_datetime(df[col], errors='coerce')
-                .dt.strftime('%Y-%m-%d')
-                .fillna('')
-            )
+            dates = pd.to_datetime(df[col], errors='coerce')
+            df[col] = dates.dt.strftime(fmt).where(dates.notna(), '')
+
+
+    def _get_url_prefix(self) -> str:
+        """
+        Build the part of the URL shared by every link: BASE_URL + URL_PATH + '/'.
+
+        Returns:
+            URL prefix, e.g. https://prominence.orca.tools/events/
+        """
+        base_url = self.config.base_url.rstrip('/')
+        url_path = self.config.url_path.rstrip('/')
+        return f"{base_url}{url_path}/"
 
 
     def _get_url_links(self, link_id: int) -> Optional[str]:
@@ -150,11 +180,20 @@ class MastersNavigationAuditAlert(BaseAlert):
             return None
 
         # Build URL: BASE_URL + URL_PATH + link_id
-        base_url = self.config.base_url.rstrip('/')
-        url_path = self.config.url_path.rstrip('/')
-        full_url = f"{base_url}{url_path}/{link_id}"
+        return f"{self._get_url_prefix()}{link_id}"
+
+
+    def _get_url_column(self, link_ids: pd.Series) -> pd.Series:
+        """
+        Vectorised counterpart of _get_url_links for a whole column of ids.
+
+        Args:
+            link_ids: Series of ids to append to the URL prefix
 
-        return full_url
+        Returns:
+            Series of complete URLs (string dtype, same index as link_ids)
+        """
+        return self._get_url_prefix() + link_ids.astype('string')
 
 
     def route_notifications(self, df:pd.DataFrame) -> List[Dict]:
@@ -183,16 +222,14 @@ class MastersNavigationAuditAlert(BaseAlert):
             cc_recipients = self._get_cc_recipients(vsl_email)
 
             # Add URLs to dataframe if ENABLE_LINKS
+            # assign() returns a new frame; the group itself is never modified
             if self.config.enable_links:
-                vessel_df = vessel_df.copy()
                 # Masters Navigation Audit doesn't use job_id - use crew_contract_id for URLs
-                vessel_df['url'] = vessel_df['crew_contract_id'].apply(
-                        self._get_url_links
-                )
+                vessel_df = vessel_df.assign(url=self._get_url_column(vessel_df['crew_contract_id']))
 
             # Keep full data with tracking columns for the job
-            # The formatter will handle which columns to display
-            full_data = vessel_df.copy()
+            # The formatter will handle which columns to display (read-only, so no copy needed)
+            full_data = vessel_df
 
             # Specify WHICH cols to display in email and in what order here
             display_columns = [
@@ -322,22 +359,11 @@ class MastersNavigationAuditAlert(BaseAlert):
         return f"AlertDev | {vessel.upper()} Master's NAV Audit & MLC Inspection"
 
 
-    def get_required_columns(self) -> List[str]:
+    def get_required_columns(self) -> Tuple[str, ...]:
         """
-        Return list of column names required in the DataFrame.
+        Return the column names required in the DataFrame.
 
         Returns:
-            List of required column names
+            Tuple of required column names (shared, not copied per call)
         """
-        return [
-            'crew_contract_id',
-            'crew_member_id',
-            'vessel_id',
-            'vsl_email',
-            'vessel',
-            'surname',
-            'full_name',
-            'rank',
-            'sign_on_date',
-            'due_date'
-        ]
+        return self.REQUIRED_COLUMNS
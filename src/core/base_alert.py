@@ -6,7 +6,7 @@ All alert implementations must inherit from BaseAlert and implement
 the abstract methods for data fetching, filtering, and routing.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 import pandas as pd
 from datetime import datetime
 from zoneinfo import ZoneInfo
@@ -130,12 +130,12 @@ class BaseAlert(ABC):
             )
 
     @abstractmethod
-    def get_required_columns(self) -> List[str]:
+    def get_required_columns(self) -> Sequence[str]:
         """
-        Return list of column names required in the DataFrame.
+        Return the column names required in the DataFrame.
 
         Returns:
-            List of required column names
+            Sequence of required column names
         """
         pass
 
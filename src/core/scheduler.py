@@ -11,7 +11,7 @@ from datetime import datetime, timedelta, time
 from src.formatters.date_formatter import duration_hours
 from zoneinfo import ZoneInfo
 from pathlib import Path
-from typing import Callable, List
+from typing import Callable, List, Optional
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -24,7 +24,7 @@ class AlertScheduler:
     Supports graceful shutdown, multiple alerts, and error recovery.
     """
     
-    def __init__(self, frequency_hours: float, timezone: str, schedule_times_timezone: str = 'Europe/Athens', schedule_times: List[str] = None, logs_dir: Path = None):
+    def __init__(self, frequency_hours: float, timezone: str, schedule_times_timezone: str = 'Europe/Athens', schedule_times: List[str] = None, logs_dir: Path = None, sleep_fn: Optional[Callable[..., bool]] = None, install_signals: bool = True):
         """
         Initialize scheduler.
         
@@ -32,6 +32,9 @@ class AlertScheduler:
             frequency_hours: Hours between alert runs (ignored if schedule_times provided)
             timezone: Timezone for scheduling and logging
             schedule_times: Optional list of daily run times in HH:MM format
+            sleep_fn: Optional interruptible sleep, called as sleep_fn(timeout=seconds) and
+                returning True if shutdown was requested (defaults to shutdown_event.wait)
+            install_signals: Register SIGTERM/SIGINT handlers for graceful shutdown
         """
         self.frequency_hours = frequency_hours
         self.schedule_times = schedule_times
@@ -39,26 +42,32 @@ class AlertScheduler:
         self.timezone = ZoneInfo(timezone)
         self.logs_dir = logs_dir or Path('/app/logs')
         self.shutdown_event = threading.Event()
+        self._sleep = sleep_fn or self.shutdown_event.wait
         self._alerts: List[Callable] = []
         
         # Register signal handlers for graceful shutdown
-        signal.signal(signal.SIGTERM, self._signal_handler)
-        signal.signal(signal.SIGINT, self._signal_handler)
+        if install_signals:
+            signal.signal(signal.SIGTERM, self._signal_handler)
+            signal.signal(signal.SIGINT, self._signal_handler)
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
         logger.info(f"Received signal {signum}. Initiating graceful shutdown...")
         self.shutdown_event.set()
     
-    def register_alert(self, alert_runner: Callable) -> None:
+    def register_alert(self, alert_runner: Callable) -> int:
         """
         Register an alert to be run on schedule.
         
         Args:
             alert_runner: Callable that executes the alert (typically alert.run())
+
+        Returns:
+            Number of alerts now registered
         """
         self._alerts.append(alert_runner)
         logger.info(f"Registered alert: {alert_runner.__name__ if hasattr(alert_runner, '__name__') else 'anonymous'}")
+        return len(self._alerts)
 
     def _write_health_status(self, logs_dir: Path, timezone: ZoneInfo) -> None:
         """Write health status to file for Docker healthcheck."""
@@ -180,8 +189,8 @@ class AlertScheduler:
                 logger.info(f"Sleeping for {duration_hours(self.frequency_hours)}")
                 logger.info(f"Next run scheduled at: {next_run.strftime('%Y-%m-%d %H:%M:%S %Z')}")
                 
-                # Use shutdown_event.wait() for interruptible sleep
-                if self.shutdown_event.wait(timeout=sleep_seconds):
+                # Interruptible sleep (shutdown_event.wait() unless sleep_fn was given)
+                if self._sleep(timeout=sleep_seconds):
                     logger.info("Shutdown requested during sleep period")
                     break
             
@@ -194,7 +203,7 @@ class AlertScheduler:
                 # Wait before retrying to avoid rapid failure loops
                 if not self.shutdown_event.is_set():
                     logger.info("Waiting 5 minutes before retry...")
-                    if self.shutdown_event.wait(timeout=300):
+                    if self._sleep(timeout=300):
                         logger.info("Shutdown requested during error recovery wait")
                         break
         
@@ -235,7 +244,7 @@ class AlertScheduler:
                 logger.info(f"Sleeping for {sleep_seconds / 3600:.2f} hours")
                 
                 # Wait until next scheduled time
-                if self.shutdown_event.wait(timeout=sleep_seconds):
+                if self._sleep(timeout=sleep_seconds):
                     logger.info("Shutdown requested during sleep period")
                     break
                 
@@ -255,7 +264,7 @@ class AlertScheduler:
                 # Wait before retrying to avoid rapid failure loops
                 if not self.shutdown_event.is_set():
                     logger.info("Waiting 5 minutes before retry...")
-                    if self.shutdown_event.wait(timeout=300):
+                    if self._sleep(timeout=300):
                         logger.info("Shutdown requested during error recovery wait")
                         break
         
@@ -3,17 +3,19 @@
 Shared pytest fixtures for all tests.
 """
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from datetime import datetime, timedelta
 import tempfile
 import json
-from unittest.mock import Mock, MagicMock
+from unittest.mock import MagicMock
+from freezegun import freeze_time
 
 from src.core.config import AlertConfig
 from src.core.tracking import EventTracker
 from src.core.scheduler import AlertScheduler
 from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
+from tests.helpers import NOW
 
 
 @pytest.fixture
@@ -23,92 +25,152 @@ def temp_dir():
         yield Path(tmpdir)
 
 
-@pytest.fixture
-def mock_config(temp_dir, monkeypatch):
-    """Create a mock AlertConfig for testing."""
-    # Set minimal required environment variables
-    monkeypatch.setenv('DB_HOST', 'localhost')
-    monkeypatch.setenv('DB_PORT', '5432')
-    monkeypatch.setenv('DB_NAME', 'test_db')
-    monkeypatch.setenv('DB_USER', 'test_user')
-    monkeypatch.setenv('DB_PASS', 'test_pass')
-    monkeypatch.setenv('USE_SSH_TUNNEL', 'False')
-    
-    monkeypatch.setenv('SMTP_HOST', 'smtp.test.com')
-    monkeypatch.setenv('SMTP_PORT', '465')
-    monkeypatch.setenv('SMTP_USER', 'test@test.com')
-    monkeypatch.setenv('SMTP_PASS', 'test_pass')
-    
-    monkeypatch.setenv('INTERNAL_RECIPIENTS', 'internal@test.com')
-    monkeypatch.setenv('PROMINENCE_EMAIL_CC_RECIPIENTS', 'prom1@test.com,prom2@test.com')
-    monkeypatch.setenv('SEATRADERS_EMAIL_CC_RECIPIENTS', 'sea1@test.com,sea2@test.com')
-    
-    monkeypatch.setenv('ENABLE_EMAIL_ALERTS', 'True')
-    monkeypatch.setenv('ENABLE_TEAMS_ALERTS', 'False')
-    
-    monkeypatch.setenv('SCHEDULE_FREQUENCY_HOURS', '0.5')
-    monkeypatch.setenv('TIMEZONE', 'Europe/Athens')
-    monkeypatch.setenv('REMINDER_FREQUENCY_DAYS', '')  # None
-    
-    monkeypatch.setenv('BASE_URL', 'https://test.orca.tools')
-    monkeypatch.setenv('LOOKBACK_DAYS', '4')
-    monkeypatch.setenv('RANK_ID', '1')
-    monkeypatch.setenv('ENABLE_LINKS', 'True')
-    monkeypatch.setenv('URL_PATH', '/events')
-    
-    monkeypatch.setenv('DRY_RUN_EMAIL', '')
-    
-    # Create directories
-    (temp_dir / 'queries').mkdir(parents=True, exist_ok=True)
-    (temp_dir / 'media').mkdir(parents=True, exist_ok=True)
-    (temp_dir / 'logs').mkdir(parents=True, exist_ok=True)
-    (temp_dir / 'data').mkdir(parents=True, exist_ok=True)
-    
-    # Load config from environment
-    config = AlertConfig.from_env(project_root=temp_dir)
-    
+@pytest.fixture(scope="module")
+def frozen_time():
+    """Freeze the clock at NOW for a whole test module.
+
+    Lets lookback filtering compare against exactly the timestamps the sample
+    rows were built from. Opt in per module with
+    pytestmark = pytest.mark.usefixtures('frozen_time').
+    """
+    with freeze_time(NOW):
+        yield NOW
+
+
+@pytest.fixture(scope="session")
+def queries_dir(tmp_path_factory):
+    """Create a queries directory holding the alert's SQL file once per session."""
+    path = tmp_path_factory.mktemp('queries')
+    (path / 'MastersNavigationAudit.sql').write_text('SELECT * FROM crew_contracts;')
+    return path
+
+
+@pytest.fixture(scope="session")
+def mock_config(tmp_path_factory):
+    """Create a mock AlertConfig for testing.
+
+    Session-scoped: the config is built once per test run. Tests must change
+    its attributes via monkeypatch.setattr so the change is undone afterwards.
+    Environment variables are only set while from_env() reads them.
+    """
+    project_root = tmp_path_factory.mktemp('project')
+
+    with pytest.MonkeyPatch.context() as mp:
+        # Set minimal required environment variables
+        mp.setenv('DB_HOST', 'localhost')
+        mp.setenv('DB_PORT', '5432')
+        mp.setenv('DB_NAME', 'test_db')
+        mp.setenv('DB_USER', 'test_user')
+        mp.setenv('DB_PASS', 'test_pass')
+        mp.setenv('USE_SSH_TUNNEL', 'False')
+
+        mp.setenv('SMTP_HOST', 'smtp.test.com')
+        mp.setenv('SMTP_PORT', '465')
+        mp.setenv('SMTP_USER', 'test@test.com')
+        mp.setenv('SMTP_PASS', 'test_pass')
+
+        mp.setenv('INTERNAL_RECIPIENTS', 'internal@test.com')
+        mp.setenv('PROMINENCE_EMAIL_CC_RECIPIENTS', 'prom1@test.com,prom2@test.com')
+        mp.setenv('SEATRADERS_EMAIL_CC_RECIPIENTS', 'sea1@test.com,sea2@test.com')
+
+        mp.setenv('ENABLE_EMAIL_ALERTS', 'True')
+        mp.setenv('ENABLE_TEAMS_ALERTS', 'False')
+
+        mp.setenv('SCHEDULE_FREQUENCY_HOURS', '0.5')
+        mp.setenv('TIMEZONE', 'Europe/Athens')
+        mp.setenv('REMINDER_FREQUENCY_DAYS', '')  # None
+
+        mp.setenv('BASE_URL', 'https://test.orca.tools')
+        mp.setenv('LOOKBACK_DAYS', '4')
+        mp.setenv('RANK_ID', '1')
+        mp.setenv('ENABLE_LINKS', 'True')
+        mp.setenv('URL_PATH', '/events')
+
+        mp.setenv('DRY_RUN_EMAIL', '')
+
+        # Create directories
+        (project_root / 'queries').mkdir(parents=True, exist_ok=True)
+        (project_root / 'media').mkdir(parents=True, exist_ok=True)
+        (project_root / 'logs').mkdir(parents=True, exist_ok=True)
+        (project_root / 'data').mkdir(parents=True, exist_ok=True)
+
+        # Load config from environment
+        config = AlertConfig.from_env(project_root=project_root)
+
     return config
 
 
+@pytest.fixture(scope="module")
+def _module_alert(mock_config):
+    """Build one MastersNavigationAuditAlert per test module."""
+    return MastersNavigationAuditAlert(mock_config)
+
+
 @pytest.fixture
-def sample_dataframe():
-    """Create sample Masters Navigation Audit DataFrame with correct schema."""
+def alert(_module_alert, monkeypatch):
+    """MastersNavigationAuditAlert bound to mock_config, shared per module.
+
+    lookback_days and rank_id are copied from config in __init__, so they are
+    restored after each test; tests may set them directly. Everything else is
+    read from self.config at call time and follows monkeypatched config.
+    """
+    for attr in ('lookback_days', 'rank_id'):
+        monkeypatch.setattr(_module_alert, attr, getattr(_module_alert, attr))
+    return _module_alert
+
+
+@pytest.fixture(scope="session")
+def _sample_dataframe_base():
+    """Build the sample Masters Navigation Audit DataFrame once per session.
+
+    Columns are typed arrays so pandas does no dtype inference. Text columns
+    are object-dtype str and due_date holds datetime.date objects, matching
+    what pd.read_sql_query returns (and what _patch_db serves in its place).
+    """
+    now = np.datetime64(NOW, 's')
+    sign_on = now - np.array([24, 48, 12, 6], dtype='timedelta64[h]')
+    due = (sign_on + np.timedelta64(14, 'D')).astype('datetime64[D]').astype(object)
+
     data = {
-        'crew_contract_id': [48941, 48942, 48943, 48944],
-        'crew_member_id': [201, 202, 203, 204],
-        'vessel_id': [1, 1, 2, 2],
-        'vessel': ['VESSEL', 'VESSEL', 'OTHER VESSEL', 'OTHER VESSEL'],
-        'vsl_email': [
+        'crew_contract_id': np.arange(48941, 48945, dtype=np.int64),
+        'crew_member_id': np.arange(201, 205, dtype=np.int64),
+        'vessel_id': np.array([1, 1, 2, 2], dtype=np.int64),
+        'vessel': np.array(['VESSEL', 'VESSEL', 'OTHER VESSEL', 'OTHER VESSEL'], dtype=object),
+        'vsl_email': np.array([
             'test@prominencemaritime.com',
             'test@prominencemaritime.com',
             'test2@seatraders.com',
             'test2@seatraders.com'
-        ],
-        'surname': ['Smith', 'Jones', 'Brown', 'Wilson'],
-        'full_name': ['John Smith', 'Jane Jones', 'Bob Brown', 'Alice Wilson'],
-        'rank': ['Captain', 'Captain', 'Captain', 'Captain'],
-        'sign_on_date': [
-            datetime.now() - timedelta(days=1),
-            datetime.now() - timedelta(days=2),
-            datetime.now() - timedelta(hours=12),
-            datetime.now() - timedelta(hours=6)
-        ],
-        'due_date': [
-            (datetime.now() - timedelta(days=1) + timedelta(days=14)).date(),
-            (datetime.now() - timedelta(days=2) + timedelta(days=14)).date(),
-            (datetime.now() - timedelta(hours=12) + timedelta(days=14)).date(),
-            (datetime.now() - timedelta(hours=6) + timedelta(days=14)).date()
-        ]
+        ], dtype=object),
+        'surname': np.array(['Smith', 'Jones', 'Brown', 'Wilson'], dtype=object),
+        'full_name': np.array(['John Smith', 'Jane Jones', 'Bob Brown', 'Alice Wilson'], dtype=object),
+        'rank': np.array(['Captain'] * 4, dtype=object),
+        'sign_on_date': sign_on,
+        'due_date': due,
     }
-    return pd.DataFrame(data)
+    return pd.DataFrame(data, copy=False)
 
 
 @pytest.fixture
-def mock_email_sender():
-    """Create mock EmailSender."""
-    sender = Mock()
-    sender.send = Mock()
-    return sender
+def sample_dataframe(_sample_dataframe_base):
+    """Sample Masters Navigation Audit DataFrame with correct schema.
+
+    A shallow copy of the session-wide frame: column assignment stays local to
+    the test, but in-place cell writes would leak into later tests.
+    """
+    return _sample_dataframe_base.copy(deep=False)
+
+
+@pytest.fixture(scope="session")
+def sample_df_head1(_sample_dataframe_base):
+    """First sample row, sliced once per session; treat as read-only."""
+    return _sample_dataframe_base.head(1)
+
+
+@pytest.fixture(scope="session")
+def sample_df_head3(_sample_dataframe_base):
+    """First three sample rows, sliced once per session; treat as read-only."""
+    return _sample_dataframe_base.head(3)
 
 
 @pytest.fixture
@@ -134,3 +196,25 @@ def mock_db_connection():
         return mock_conn
     
     return mock_get_db_connection, mock_cursor
+
+
+@pytest.fixture
+def make_scheduler():
+    """Factory building a fresh AlertScheduler per call.
+
+    Schedulers skip signal registration, so none installs real SIGTERM/SIGINT
+    handlers in the pytest process; the handler is exercised directly instead.
+    """
+    def make(frequency_hours=24, timezone='Europe/Athens',
+             schedule_times_timezone='Europe/Athens', schedule_times=None,
+             sleep_fn=None):
+        return AlertScheduler(
+            frequency_hours=frequency_hours,
+            timezone=timezone,
+            schedule_times_timezone=schedule_times_timezone,
+            schedule_times=list(schedule_times) if schedule_times else None,
+            sleep_fn=sleep_fn,
+            install_signals=False,
+        )
+
+    return make
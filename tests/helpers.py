@@ -0,0 +1,9 @@
+# tests/helpers.py
+"""
+Plain constants shared by test modules and conftest.py.
+"""
+from datetime import datetime
+
+
+# Fixed "current" time for dated test rows; see the frozen_time fixture
+NOW = datetime(2025, 1, 15, 12, 0, 0)
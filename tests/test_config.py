@@ -42,10 +42,10 @@ def test_config_validation_passes_with_valid_data(mock_config):
     mock_config.validate()
 
 
-def test_config_validation_fails_without_smtp_credentials(mock_config):
+def test_config_validation_fails_without_smtp_credentials(mock_config, monkeypatch):
     """Test that validation fails when email enabled but no SMTP credentials."""
-    mock_config.enable_email_alerts = True
-    mock_config.smtp_user = ''
+    monkeypatch.setattr(mock_config, 'enable_email_alerts', True)
+    monkeypatch.setattr(mock_config, 'smtp_user', '')
 
     with pytest.raises(ValueError, match="Required configuration missing"):
         mock_config.validate()
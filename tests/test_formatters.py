@@ -68,14 +68,14 @@ def test_html_formatter_displays_only_specified_columns(mock_config, sample_data
     assert 'Rank' in html
 
 
-def test_route_notifications_adds_urls(mock_config, sample_dataframe):
+def test_route_notifications_adds_urls(mock_config, sample_dataframe, monkeypatch):
     """Test that route_notifications adds url column when links enabled."""
     from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
     
     # Enable links
-    mock_config.enable_links = True
-    mock_config.base_url = 'https://test.com'
-    mock_config.url_path = '/events'
+    monkeypatch.setattr(mock_config, 'enable_links', True)
+    monkeypatch.setattr(mock_config, 'base_url', 'https://test.com')
+    monkeypatch.setattr(mock_config, 'url_path', '/events')
     
     alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
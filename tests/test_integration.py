@@ -2,186 +2,214 @@
 """
 Integration tests for complete alert workflow.
 """
+import re
 import pytest
+from collections import Counter
 from unittest.mock import patch, MagicMock
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-
-
-def test_alert_initializes_correctly(mock_config):
+from datetime import timedelta
+
+from src.formatters.html_formatter import HTMLFormatter
+from src.formatters.text_formatter import TextFormatter
+from src.notifications.email_sender import EmailSender
+from tests.helpers import NOW
+
+
+pytestmark = pytest.mark.usefixtures('frozen_time')
+
+
+DATETIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+ALERT_MODULE = 'src.alerts.masters_navigation_audit'
+
+
+def _serve_frame(monkeypatch, df):
+    """Make the alert's database query return df."""
+    monkeypatch.setattr(f'{ALERT_MODULE}.pd.read_sql_query', lambda *args, **kwargs: df)
+
+
+def _jobs_by_vessel(jobs):
+    """Index notification jobs by their vessel name."""
+    return {job['metadata']['vessel_name']: job for job in jobs}
+
+
+@pytest.fixture(autouse=True)
+def _patch_db(monkeypatch, sample_dataframe):
+    """Stub out the database: queries return sample_dataframe unless a test serves its own frame."""
+    conn = MagicMock()
+    conn.__enter__.return_value = MagicMock()
+    monkeypatch.setattr(f'{ALERT_MODULE}.get_db_connection', lambda *args, **kwargs: conn)
+    _serve_frame(monkeypatch, sample_dataframe)
+
+
+@pytest.fixture(autouse=True)
+def _shared_queries_dir(mock_config, queries_dir, monkeypatch):
+    """Point mock_config at the session-wide queries directory."""
+    monkeypatch.setattr(mock_config, 'queries_dir', queries_dir)
+
+
+@pytest.fixture(scope="module")
+def df_factory():
+    """
+    Build Masters Navigation Audit DataFrames from one template row.
+
+    Scalar overrides are tiled across n rows; list overrides are used as-is.
+    due_date defaults to 14 days after sign_on_date. Scalar date columns are
+    built as typed datetime64 arrays so pandas skips object-dtype inference.
+    """
+    template = {
+        'crew_contract_id': 101,
+        'crew_member_id': 201,
+        'vessel_id': 123,
+        'vessel': 'TEST VESSEL',
+        'vsl_email': 'test@prominencemaritime.com',
+        'surname': 'Smith',
+        'full_name': 'John Smith',
+        'rank': 'Captain',
+    }
+    date_dtypes = {'sign_on_date': 'datetime64[ns]', 'due_date': 'datetime64[D]'}
+
+    def make(n=1, sign_on_offset=timedelta(days=1), **overrides):
+        sign_on = NOW - sign_on_offset
+        row = {
+            **template,
+            'sign_on_date': sign_on,
+            'due_date': (sign_on + timedelta(days=14)).date(),
+            **overrides,
+        }
+        return pd.DataFrame({
+            col: value if isinstance(value, list) else np.tile(np.asarray([value], dtype=date_dtypes.get(col)), n)
+            for col, value in row.items()
+        })
+
+    return make
+
+
+@pytest.fixture
+def extended_dataframe(sample_dataframe):
+    """sample_dataframe plus one captain who signed on 5 days ago."""
+    # Append the old record to the sample rows and build the frame once
+    old_record = {
+        **sample_dataframe.iloc[0].to_dict(),
+        'crew_contract_id': 999,
+        'crew_member_id': 999,
+        'vessel_id': 999,
+        'vessel': 'OLD VESSEL',
+        'vsl_email': 'old@test.com',
+        'surname': 'Old',
+        'full_name': 'Old Captain',
+        'sign_on_date': NOW - timedelta(days=5),
+    }
+    return pd.DataFrame(sample_dataframe.to_dict('records') + [old_record])
+
+
+@pytest.fixture
+def wired_config(mock_config, mock_event_tracker, monkeypatch):
+    """mock_config with a real tracker and mocked email sender and formatters."""
+    email_sender = MagicMock(spec_set=EmailSender)
+    html_formatter = MagicMock(spec_set=HTMLFormatter)
+    html_formatter.format.return_value = '<html>Test</html>'
+    text_formatter = MagicMock(spec_set=TextFormatter)
+    text_formatter.format.return_value = 'Test'
+
+    monkeypatch.setattr(mock_config, 'tracker', mock_event_tracker)
+    monkeypatch.setattr(mock_config, 'email_sender', email_sender)
+    monkeypatch.setattr(mock_config, 'html_formatter', html_formatter)
+    monkeypatch.setattr(mock_config, 'text_formatter', text_formatter)
+    return mock_config, email_sender
+
+
+@pytest.fixture
+def configured_alert(alert, wired_config):
+    """Alert ready for a full run(): stubbed DB, real tracker, mocked sender.
+
+    Returns (alert, email_sender).
+    """
+    _, email_sender = wired_config
+    return alert, email_sender
+
+
+def test_alert_initializes_correctly(alert, mock_config):
     """Test that alert initializes with correct configuration."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
     assert alert.sql_query_file == 'MastersNavigationAudit.sql'
     assert alert.lookback_days == mock_config.lookback_days
     assert alert.rank_id == mock_config.rank_id
 
 
-def test_alert_filters_data_by_lookback_days(mock_config, sample_dataframe):
-    """Test that filter_data correctly filters by lookback days."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    alert.lookback_days = 1  # Last 24 hours
-    
-    # Sample data has one captain who signed on 2 days ago (outside lookback)
-    filtered = alert.filter_data(sample_dataframe)
-    
-    # Should filter out the one that's 2 days old
-    assert len(filtered) == 3  # Changed from 4 to 3
-
-
-def test_alert_filters_out_old_data(mock_config, sample_dataframe):
-    """Test that old data is filtered out."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    # Create old record by copying a row and modifying it
-    old_record = sample_dataframe.iloc[[0]].copy()
-    old_record['crew_contract_id'] = 999
-    old_record['crew_member_id'] = 999
-    old_record['vessel_id'] = 999
-    old_record['vessel'] = 'OLD VESSEL'
-    old_record['vsl_email'] = 'old@test.com'
-    old_record['surname'] = 'Old'
-    old_record['full_name'] = 'Old Captain'
-    old_record['sign_on_date'] = datetime.now() - timedelta(days=5)
-    
-    df_with_old = pd.concat([sample_dataframe, old_record], ignore_index=True)
+@pytest.mark.parametrize("lookback,expected_rows", [(1, 3), (3, 4), (10, 5)])
+def test_lookback_filter(alert, extended_dataframe, lookback, expected_rows):
+    """Test that filter_data keeps only captains signed on within lookback_days."""
+    # extended_dataframe sign-on ages: 6h, 12h, 1d, 2d and 5d (crew_contract_id 999)
+    alert.lookback_days = lookback
     
-    alert = MastersNavigationAuditAlert(mock_config)
-    alert.lookback_days = 1
+    filtered = alert.filter_data(extended_dataframe)
     
-    filtered = alert.filter_data(df_with_old)
-    
-    # Should exclude the old record (and one from sample that's 2 days old)
-    assert len(filtered) == 3  # Changed from 4 to 3
-    assert 999 not in filtered['crew_contract_id'].values
+    assert len(filtered) == expected_rows
+    assert (999 in filtered['crew_contract_id'].values) == (lookback >= 5)
 
 
-def test_alert_routes_by_vessel(mock_config, sample_dataframe):
+def test_alert_routes_by_vessel(alert, sample_dataframe):
     """Test that notifications are routed correctly by vessel."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
     
     # Should create 2 jobs (VESSEL with 2 captains, OTHER VESSEL with 2 captains)
     assert len(jobs) == 2
     
     # Check first vessel job
-    vessel_job = next(j for j in jobs if j['metadata']['vessel_name'] == 'VESSEL')
+    vessel_job = _jobs_by_vessel(jobs)['VESSEL']
     assert len(vessel_job['data']) == 2
     assert vessel_job['recipients'] == ['test@prominencemaritime.com']
 
 
-def test_alert_assigns_correct_cc_recipients(mock_config, sample_dataframe):
+@pytest.mark.parametrize("vessel,expected_cc", [
+    ('VESSEL', {'prom1@test.com', 'prom2@test.com'}),           # prominencemaritime.com
+    ('OTHER VESSEL', {'sea1@test.com', 'sea2@test.com'}),       # seatraders.com
+])
+def test_alert_assigns_correct_cc_recipients(alert, sample_dataframe, vessel, expected_cc):
     """Test that CC recipients are assigned based on email domain plus internal recipients."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    jobs = alert.route_notifications(sample_dataframe)
-    
-    # Sample data has BOTH Prominence and Seatraders vessels
-    for job in jobs:
-        cc_recipients = job['cc_recipients']
-        
-        # Check domain-specific CC based on vessel email
-        if 'prominencemaritime' in job['recipients'][0]:
-            # Should include Prominence CC recipients
-            assert 'prom1@test.com' in cc_recipients
-            assert 'prom2@test.com' in cc_recipients
-        elif 'seatraders' in job['recipients'][0]:
-            # Should include Seatraders CC recipients
-            assert 'sea1@test.com' in cc_recipients
-            assert 'sea2@test.com' in cc_recipients
-        
-        # Should ALSO include internal recipients (from conftest.py)
-        assert 'internal@test.com' in cc_recipients
-
-
-def test_alert_prominence_domain_gets_prominence_cc(mock_config):
-    """Test that Prominence domain gets Prominence CC recipients."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    # Create test dataframe with Prominence vessel
-    test_df = pd.DataFrame({
-        'crew_contract_id': [101],
-        'crew_member_id': [201],
-        'vessel_id': [123],
-        'vessel': ['TEST VESSEL'],
-        'vsl_email': ['test@prominencemaritime.com'],
-        'surname': ['Smith'],
-        'full_name': ['John Smith'],
-        'rank': ['Captain'],
-        'sign_on_date': [datetime.now() - timedelta(days=1)],
-        'due_date': [(datetime.now() - timedelta(days=1) + timedelta(days=14)).date()],
-    })
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    jobs = alert.route_notifications(test_df)
+    jobs_by_vessel = _jobs_by_vessel(alert.route_notifications(sample_dataframe))
+    cc_recipients = jobs_by_vessel[vessel]['cc_recipients']
     
-    assert len(jobs) == 1
-    cc_recipients = jobs[0]['cc_recipients']
+    # Should include the domain-specific CC recipients
+    assert expected_cc <= set(cc_recipients)
     
-    # Should include Prominence CC recipients
-    assert 'prom1@test.com' in cc_recipients
-    assert 'prom2@test.com' in cc_recipients
+    # Should ALSO include internal recipients (from conftest.py)
+    assert 'internal@test.com' in cc_recipients
 
 
-def test_alert_seatraders_domain_gets_seatraders_cc(mock_config):
-    """Test that Seatraders domain gets Seatraders CC recipients."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
+@pytest.mark.parametrize("vsl_email,vessel,expected_cc", [
+    ('test@prominencemaritime.com', 'TEST VESSEL', ['prom1@test.com', 'prom2@test.com']),
+    ('test@seatraders.com', 'SEA VESSEL', ['sea1@test.com', 'sea2@test.com']),
+])
+def test_alert_domain_gets_domain_cc(alert, df_factory, vsl_email, vessel, expected_cc):
+    """Test that each routed domain gets its own CC recipients."""
+    test_df = df_factory(vsl_email=vsl_email, vessel=vessel)
     
-    # Create test dataframe with Seatraders vessel
-    test_df = pd.DataFrame({
-        'crew_contract_id': [101],
-        'crew_member_id': [201],
-        'vessel_id': [789],
-        'vessel': ['SEA VESSEL'],
-        'vsl_email': ['test@seatraders.com'],
-        'surname': ['Jones'],
-        'full_name': ['Jane Jones'],
-        'rank': ['Captain'],
-        'sign_on_date': [datetime.now() - timedelta(days=1)],
-        'due_date': [(datetime.now() - timedelta(days=1) + timedelta(days=14)).date()],
-    })
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(test_df)
     
     assert len(jobs) == 1
     cc_recipients = jobs[0]['cc_recipients']
     
-    # Should include Seatraders CC recipients
-    assert 'sea1@test.com' in cc_recipients
-    assert 'sea2@test.com' in cc_recipients
+    # Should include the domain's CC recipients
+    for recipient in expected_cc:
+        assert recipient in cc_recipients
 
 
-def test_alert_generates_correct_subject_lines(mock_config, sample_dataframe):
+def test_alert_generates_correct_subject_lines(alert, sample_df_head1, sample_df_head3):
     """Test subject line generation."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
     # Single record
-    single_df = sample_dataframe.iloc[:1]
-    subject_single = alert.get_subject_line(single_df, {'vessel_name': 'TEST VESSEL'})
+    subject_single = alert.get_subject_line(sample_df_head1, {'vessel_name': 'TEST VESSEL'})
     assert subject_single == "AlertDev | TEST VESSEL Master's NAV Audit & MLC Inspection"
     
     # Multiple records (same subject format regardless of count)
-    multi_df = sample_dataframe.iloc[:3]
-    subject_multi = alert.get_subject_line(multi_df, {'vessel': 'VESSEL'})
+    subject_multi = alert.get_subject_line(sample_df_head3, {'vessel': 'VESSEL'})
     assert subject_multi == "AlertDev | VESSEL Master's NAV Audit & MLC Inspection"
 
 
-def test_alert_generates_correct_tracking_keys(mock_config, sample_dataframe):
+def test_alert_generates_correct_tracking_keys(alert, sample_dataframe):
     """Test that tracking keys are generated correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
     row = sample_dataframe.iloc[0]
     key = alert.get_tracking_key(row)
     
@@ -194,11 +222,8 @@ def test_alert_generates_correct_tracking_keys(mock_config, sample_dataframe):
     assert '__' in key  # Double underscore separator
 
 
-def test_alert_required_columns_validation(mock_config):
+def test_alert_required_columns_validation(alert):
     """Test that required columns are correctly defined."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     required = alert.get_required_columns()
     
     # Masters Navigation Audit schema
@@ -214,12 +239,8 @@ def test_alert_required_columns_validation(mock_config):
     assert 'due_date' in required
 
 
-def test_alert_validates_dataframe_columns(mock_config, sample_dataframe):
+def test_alert_validates_dataframe_columns(alert, sample_dataframe):
     """Test that DataFrame validation works correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
     # Should not raise exception with valid DataFrame
     alert.validate_required_columns(sample_dataframe)
     
@@ -229,14 +250,11 @@ def test_alert_validates_dataframe_columns(mock_config, sample_dataframe):
         alert.validate_required_columns(invalid_df)
 
 
-def test_alert_includes_internal_recipients_in_cc(mock_config, sample_dataframe):
+def test_alert_includes_internal_recipients_in_cc(alert, mock_config, sample_dataframe, monkeypatch):
     """Test that internal recipients are always included in CC."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
     # Set up internal recipients
-    mock_config.internal_recipients = ['admin@company.com', 'manager@company.com']
+    monkeypatch.setattr(mock_config, 'internal_recipients', ['admin@company.com', 'manager@company.com'])
     
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
     
     # Check all jobs include internal recipients in CC
@@ -248,40 +266,28 @@ def test_alert_includes_internal_recipients_in_cc(mock_config, sample_dataframe)
             f"Internal recipient 'admin@company.com' missing from CC: {cc_recipients}"
         assert 'manager@company.com' in cc_recipients, \
             f"Internal recipient 'manager@company.com' missing from CC: {cc_recipients}"
-        
-        # Domain-specific recipients should also be present
-        # Sample data has BOTH Prominence and Seatraders vessels
-        # So we check based on the recipient email
-        if 'prominencemaritime' in job['recipients'][0]:
-            assert 'prom1@test.com' in cc_recipients
-            assert 'prom2@test.com' in cc_recipients
-        elif 'seatraders' in job['recipients'][0]:
-            assert 'sea1@test.com' in cc_recipients
-            assert 'sea2@test.com' in cc_recipients
-
-
-def test_alert_internal_recipients_when_no_domain_match(mock_config):
+    
+    # Domain-specific recipients should also be present
+    # Sample data has BOTH Prominence (VESSEL) and Seatraders (OTHER VESSEL) vessels
+    jobs_by_vessel = _jobs_by_vessel(jobs)
+    assert {'prom1@test.com', 'prom2@test.com'} <= set(jobs_by_vessel['VESSEL']['cc_recipients'])
+    assert {'sea1@test.com', 'sea2@test.com'} <= set(jobs_by_vessel['OTHER VESSEL']['cc_recipients'])
+
+
+def test_alert_internal_recipients_when_no_domain_match(alert, mock_config, df_factory, monkeypatch):
     """Test that internal recipients are used when domain doesn't match routing."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    # Create dataframe with unknown domain
-    unknown_domain_df = pd.DataFrame({
-        'crew_contract_id': [101],
-        'crew_member_id': [201],
-        'vessel_id': [999],
-        'vessel': ['UNKNOWN VESSEL'],
-        'vsl_email': ['unknown@unknowndomain.com'],  # Not in routing
-        'surname': ['Unknown'],
-        'full_name': ['Captain Unknown'],
-        'rank': ['Captain'],
-        'sign_on_date': [datetime.now() - timedelta(days=1)],
-        'due_date': [(datetime.now() - timedelta(days=1) + timedelta(days=14)).date()],
-    })
+    # Create dataframe with unknown domain (not in routing)
+    unknown_domain_df = df_factory(
+        vessel_id=999,
+        vessel='UNKNOWN VESSEL',
+        vsl_email='unknown@unknowndomain.com',
+        surname='Unknown',
+        full_name='Captain Unknown',
+    )
     
     # Set up internal recipients
-    mock_config.internal_recipients = ['admin@company.com', 'manager@company.com']
+    monkeypatch.setattr(mock_config, 'internal_recipients', ['admin@company.com', 'manager@company.com'])
     
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(unknown_domain_df)
     
     # Should have one job
@@ -294,42 +300,33 @@ def test_alert_internal_recipients_when_no_domain_match(mock_config):
     assert len(cc_recipients) == 2  # Only internal, no domain-specific
 
 
-def test_alert_deduplicates_cc_recipients(mock_config, sample_dataframe):
+def test_alert_deduplicates_cc_recipients(alert, mock_config, sample_dataframe, monkeypatch):
     """Test that duplicate emails in CC list are removed."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
     # Set internal recipients to overlap with domain CC (prom1@test.com)
-    mock_config.internal_recipients = ['prom1@test.com', 'admin@company.com']
+    monkeypatch.setattr(mock_config, 'internal_recipients', ['prom1@test.com', 'admin@company.com'])
     
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
     
-    # Check that duplicates are removed
-    for job in jobs:
-        cc_recipients = job['cc_recipients']
-        
-        # Should not have duplicates
-        assert len(cc_recipients) == len(set(cc_recipients)), \
-            f"Duplicate emails found in CC list: {cc_recipients}"
-        
-        # Check based on vessel domain
-        if 'prominencemaritime' in job['recipients'][0]:
-            # prom1@test.com should appear only once (even though it's in both lists)
-            assert cc_recipients.count('prom1@test.com') == 1
-            # Should have 3 unique recipients: prom1, prom2, admin (prom1 appears in both lists)
-            assert len(cc_recipients) == 3
-        elif 'seatraders' in job['recipients'][0]:
-            # Seatraders vessels get: sea1, sea2, prom1 (from internal), admin
-            # Should have 4 unique recipients
-            assert len(cc_recipients) == 4
-
-
-def test_alert_format_date_column(mock_config):
-    """Test that _format_date_column formats dates correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
+    jobs_by_vessel = _jobs_by_vessel(jobs)
+    cc_counts = {vessel: Counter(job['cc_recipients']) for vessel, job in jobs_by_vessel.items()}
+    
+    # Should not have duplicates (one Counter pass per CC list)
+    for vessel, counts in cc_counts.items():
+        duplicates = [email for email, n in counts.items() if n > 1]
+        assert not duplicates, f"Duplicate emails found in CC list for {vessel}: {duplicates}"
     
-    alert = MastersNavigationAuditAlert(mock_config)
+    # Prominence vessel: prom1@test.com should appear only once (even though it's in both lists)
+    assert cc_counts['VESSEL']['prom1@test.com'] == 1
+    # Should have 3 unique recipients: prom1, prom2, admin (prom1 appears in both lists)
+    assert len(jobs_by_vessel['VESSEL']['cc_recipients']) == 3
     
+    # Seatraders vessel gets: sea1, sea2, prom1 (from internal), admin
+    # Should have 4 unique recipients
+    assert len(jobs_by_vessel['OTHER VESSEL']['cc_recipients']) == 4
+
+
+def test_alert_format_date_column(alert):
+    """Test that _format_date_column formats dates correctly."""
     # Create test dataframe with various date formats
     test_df = pd.DataFrame({
         'test_date': [
@@ -349,43 +346,27 @@ def test_alert_format_date_column(mock_config):
     assert test_df['test_date'].iloc[3] == ''  # NaT becomes empty string
 
 
-def test_alert_get_url_links_when_enabled(mock_config):
-    """Test URL generation when links are enabled."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    mock_config.enable_links = True
-    mock_config.base_url = 'https://prominence.orca.tools'
-    mock_config.url_path = '/events'
-    
-    alert = MastersNavigationAuditAlert(mock_config)
+@pytest.mark.parametrize("enable_links,expected", [
+    (True, 'https://prominence.orca.tools/events/12345'),
+    (False, None),
+])
+def test_alert_get_url_links(alert, mock_config, enable_links, expected, monkeypatch):
+    """Test URL generation with links enabled and disabled."""
+    monkeypatch.setattr(mock_config, 'enable_links', enable_links)
+    monkeypatch.setattr(mock_config, 'base_url', 'https://prominence.orca.tools')
+    monkeypatch.setattr(mock_config, 'url_path', '/events')
     
     url = alert._get_url_links(12345)
     
-    assert url == 'https://prominence.orca.tools/events/12345'
+    assert url == expected
 
 
-def test_alert_get_url_links_when_disabled(mock_config):
-    """Test URL generation when links are disabled."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    mock_config.enable_links = False
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
-    url = alert._get_url_links(12345)
-    
-    assert url is None
-
-
-def test_alert_url_links_added_to_dataframe(mock_config, sample_dataframe):
+def test_alert_url_links_added_to_dataframe(alert, mock_config, sample_dataframe, monkeypatch):
     """Test that URL links are added to dataframe when enabled."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    mock_config.enable_links = True
-    mock_config.base_url = 'https://prominence.orca.tools'
-    mock_config.url_path = '/events'
+    monkeypatch.setattr(mock_config, 'enable_links', True)
+    monkeypatch.setattr(mock_config, 'base_url', 'https://prominence.orca.tools')
+    monkeypatch.setattr(mock_config, 'url_path', '/events')
     
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
     
     # Check that jobs have URL column
@@ -395,11 +376,8 @@ def test_alert_url_links_added_to_dataframe(mock_config, sample_dataframe):
         assert job['data']['url'].notna().all()
 
 
-def test_alert_display_columns_specified(mock_config, sample_dataframe):
+def test_alert_display_columns_specified(alert, sample_dataframe):
     """Test that display_columns are specified in metadata."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
     
     expected_display_columns = [
@@ -409,136 +387,70 @@ def test_alert_display_columns_specified(mock_config, sample_dataframe):
         'due_date'
     ]
     
-    for job in jobs:
-        assert 'display_columns' in job['metadata']
-        assert job['metadata']['display_columns'] == expected_display_columns
-
-
-def test_alert_get_company_name_prominence(mock_config):
-    """Test company name determination for Prominence."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
-    company = alert._get_company_name('vessel@prominencemaritime.com')
-    assert company == 'Prominence Maritime S.A.'
-    
-    company = alert._get_company_name('vessel@vsl.prominencemaritime.com')
-    assert company == 'Prominence Maritime S.A.'
+    display_columns = [job['metadata'].get('display_columns') for job in jobs]
+    assert display_columns == [expected_display_columns] * len(jobs)
 
 
-def test_alert_get_company_name_seatraders(mock_config):
-    """Test company name determination for Seatraders."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
-    company = alert._get_company_name('vessel@seatraders.com')
-    assert company == 'Sea Traders S.A.'
-    
-    company = alert._get_company_name('vessel@vsl.seatraders.com')
-    assert company == 'Sea Traders S.A.'
-
-
-def test_alert_get_company_name_default(mock_config):
-    """Test company name determination for unknown domain."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
-    company = alert._get_company_name('vessel@unknown.com')
-    assert company == 'Prominence Maritime S.A.'  # Default
+@pytest.mark.parametrize("email,expected", [
+    ('vessel@prominencemaritime.com', 'Prominence Maritime S.A.'),
+    ('vessel@vsl.prominencemaritime.com', 'Prominence Maritime S.A.'),
+    ('vessel@seatraders.com', 'Sea Traders S.A.'),
+    ('vessel@vsl.seatraders.com', 'Sea Traders S.A.'),
+    ('vessel@unknown.com', 'Prominence Maritime S.A.'),  # Default
+])
+def test_alert_get_company_name(alert, email, expected):
+    """Test company name determination from vessel email domain."""
+    assert alert._get_company_name(email) == expected
 
 
-def test_alert_filter_replaces_null_values(mock_config):
+def test_alert_filter_replaces_null_values(alert, df_factory):
     """Test that filter_data replaces null values with empty strings."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
     # Create dataframe with null values
-    test_df = pd.DataFrame({
-        'crew_contract_id': [101],
-        'crew_member_id': [201],
-        'vessel_id': [123],
-        'vessel': ['TEST VESSEL'],
-        'vsl_email': ['test@test.com'],
-        'surname': [None],  # Null
-        'full_name': ['John Smith'],
-        'rank': [None],  # Null
-        'sign_on_date': [datetime.now().strftime('%Y-%m-%d')],
-        'due_date': ['2025-12-15'],
-    })
+    test_df = df_factory(
+        vsl_email='test@test.com',
+        surname=None,
+        rank=None,
+        sign_on_date=NOW.strftime('%Y-%m-%d'),
+        due_date='2025-12-15',
+    )
     
-    alert = MastersNavigationAuditAlert(mock_config)
     filtered = alert.filter_data(test_df)
     
     # Check that nulls are replaced with empty strings
-    assert filtered['surname'].iloc[0] == '' or pd.isna(filtered['surname'].iloc[0])
-    assert filtered['rank'].iloc[0] == '' or pd.isna(filtered['rank'].iloc[0])
+    vals = filtered[['surname', 'rank']].iloc[0]
+    assert vals['surname'] == ''
+    assert vals['rank'] == ''
 
 
-def test_alert_filter_formats_dates_correctly(mock_config, sample_dataframe):
+def test_alert_filter_formats_dates_correctly(alert, sample_dataframe):
     """Test that filter_data formats dates correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     filtered = alert.filter_data(sample_dataframe)
     
-    # sign_on_date should be formatted as datetime string
-    for sign_on_date in filtered['sign_on_date']:
-        # Should match format: YYYY-MM-DD HH:MM:SS
-        assert len(sign_on_date) == 19
-        assert sign_on_date[4] == '-'
-        assert sign_on_date[7] == '-'
-        assert sign_on_date[10] == ' '
-        assert sign_on_date[13] == ':'
-        assert sign_on_date[16] == ':'
-    
-    # due_date should be formatted as date strings
-    for due_date in filtered['due_date']:
-        # Should match format: YYYY-MM-DD
-        assert len(due_date) == 10
-        assert due_date[4] == '-'
-        assert due_date[7] == '-'
-
-
-@patch('src.alerts.masters_navigation_audit.get_db_connection')
-@patch('src.alerts.masters_navigation_audit.pd.read_sql_query')
-@patch('src.notifications.email_sender.EmailSender.send')
-def test_complete_alert_workflow(mock_send, mock_read_sql, mock_get_db, mock_config, sample_dataframe, mock_event_tracker, temp_dir):
-    """Test complete alert workflow from fetch to send."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    from src.formatters.html_formatter import HTMLFormatter
-    from src.formatters.text_formatter import TextFormatter
-    from src.notifications.email_sender import EmailSender
-
-    # Mock get_db_connection to return a dummy context manager
-    mock_conn = MagicMock()
-    mock_get_db.return_value.__enter__.return_value = mock_conn
-    mock_get_db.return_value.__exit__.return_value = None
-
-    # Mock pd.read_sql_query to return sample data
-    mock_read_sql.return_value = sample_dataframe
+    # sign_on_date should be formatted as datetime string: YYYY-MM-DD HH:MM:SS
+    assert filtered['sign_on_date'].str.match(DATETIME_RE).all()
+    
+    # due_date should be formatted as date string: YYYY-MM-DD
+    assert filtered['due_date'].str.match(DATE_RE).all()
 
-    # Create SQL query file
-    mock_config.queries_dir.mkdir(parents=True, exist_ok=True)
-    sql_file = mock_config.queries_dir / 'MastersNavigationAudit.sql'
-    sql_file.write_text('SELECT * FROM crew_contracts;')
 
+@pytest.mark.slow
+@patch('src.notifications.email_sender.EmailSender.send')
+def test_complete_alert_workflow(mock_send, alert, mock_config, sample_dataframe, mock_event_tracker, temp_dir, monkeypatch):
+    """Test complete alert workflow from fetch to send."""
     # Initialize components
-    mock_config.tracker = mock_event_tracker
-    mock_config.email_sender = EmailSender(
+    monkeypatch.setattr(mock_config, 'tracker', mock_event_tracker)
+    monkeypatch.setattr(mock_config, 'email_sender', EmailSender(
         smtp_host='smtp.test.com',
         smtp_port=465,
         smtp_user='test@test.com',
         smtp_pass='password',
         company_logos={},
         dry_run=False
-    )
-    mock_config.html_formatter = HTMLFormatter()
-    mock_config.text_formatter = TextFormatter()
+    ))
+    monkeypatch.setattr(mock_config, 'html_formatter', HTMLFormatter())
+    monkeypatch.setattr(mock_config, 'text_formatter', TextFormatter())
 
-    # Create and run alert
-    alert = MastersNavigationAuditAlert(mock_config)
+    # Run alert
     alert.run()
 
     # Verify email was sent (2 vessels = 2 emails: VESSEL and OTHER VESSEL)
@@ -548,61 +460,31 @@ def test_complete_alert_workflow(mock_send, mock_read_sql, mock_get_db, mock_con
     assert len(mock_event_tracker.sent_events) == 4
 
 
-@patch('src.alerts.masters_navigation_audit.get_db_connection')
-@patch('src.alerts.masters_navigation_audit.pd.read_sql_query')
-def test_alert_prevents_duplicate_sends(mock_read_sql, mock_get_db, mock_config, sample_dataframe, mock_event_tracker, temp_dir):
+@pytest.mark.slow
+def test_alert_prevents_duplicate_sends(configured_alert, sample_dataframe, mock_event_tracker):
     """Test that alert doesn't send duplicates."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
-    # Mock get_db_connection
-    mock_conn = MagicMock()
-    mock_get_db.return_value.__enter__.return_value = mock_conn
-    mock_get_db.return_value.__exit__.return_value = None
-
-    # Mock pd.read_sql_query to return sample data
-    mock_read_sql.return_value = sample_dataframe
-
-    # Create SQL query file
-    sql_file = mock_config.queries_dir / 'MastersNavigationAudit.sql'
-    sql_file.write_text('SELECT * FROM crew_contracts;')
-
-    # Initialize
-    mock_config.tracker = mock_event_tracker
-    mock_email_sender = MagicMock()
-    mock_config.email_sender = mock_email_sender
-    mock_config.html_formatter = MagicMock()
-    mock_config.text_formatter = MagicMock()
-
-    # Mock formatters to return dummy content
-    mock_config.html_formatter.format.return_value = '<html>Test</html>'
-    mock_config.text_formatter.format.return_value = 'Test'
+    alert, mock_email_sender = configured_alert
 
     # First run - should send
-    alert = MastersNavigationAuditAlert(mock_config)
     alert.run()
 
-    first_call_count = mock_email_sender.send.call_count
-    assert first_call_count > 0
-
-    # Second run - should not send (duplicates)
-    alert2 = MastersNavigationAuditAlert(mock_config)
-    alert2.run()
+    mock_email_sender.send.assert_called()
 
-    # Call count should be same (no new sends)
-    assert mock_email_sender.send.call_count == first_call_count
+    # Every filtered record is now tracked, so a second run would find
+    # nothing unsent and never reach routing or the email sender
+    filtered = alert.filter_data(sample_dataframe)
+    keys = [alert.get_tracking_key(row) for _, row in filtered.iterrows()]
+    assert keys
+    assert all(mock_event_tracker.is_sent(key) for key in keys)
+    assert mock_event_tracker.filter_unsent_events(filtered, key_func=alert.get_tracking_key).empty
 
 
-def test_dry_run_email_redirection(mock_config, sample_dataframe, temp_dir):
+def test_dry_run_email_redirection(alert, mock_config, sample_dataframe, temp_dir, monkeypatch):
     """Test that dry-run mode redirects emails correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
     # Enable dry-run with email redirection
-    mock_config.dry_run = True
-    mock_config.dry_run_email = 'dryrun@test.com'
-    mock_config.enable_email_alerts = True
-
-    # Create alert
-    alert = MastersNavigationAuditAlert(mock_config)
+    monkeypatch.setattr(mock_config, 'dry_run', True)
+    monkeypatch.setattr(mock_config, 'dry_run_email', 'dryrun@test.com')
+    monkeypatch.setattr(mock_config, 'enable_email_alerts', True)
 
     # Route notifications
     jobs = alert.route_notifications(sample_dataframe)
@@ -614,38 +496,20 @@ def test_dry_run_email_redirection(mock_config, sample_dataframe, temp_dir):
         assert 'prominencemaritime.com' in job['recipients'][0] or 'seatraders.com' in job['recipients'][0]
 
 
-@patch('src.alerts.masters_navigation_audit.get_db_connection')
-@patch('src.alerts.masters_navigation_audit.pd.read_sql_query')
-def test_alert_handles_empty_results(mock_read_sql, mock_get_db, mock_config, mock_event_tracker, temp_dir):
+@pytest.mark.slow
+def test_alert_handles_empty_results(configured_alert, monkeypatch):
     """Test that alert handles empty database results gracefully."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
-    # Mock get_db_connection
-    mock_conn = MagicMock()
-    mock_get_db.return_value.__enter__.return_value = mock_conn
-    mock_get_db.return_value.__exit__.return_value = None
-
     # Mock pd.read_sql_query to return empty DataFrame with Masters Navigation Audit schema
     empty_df = pd.DataFrame(columns=[
         'crew_contract_id', 'crew_member_id', 'vessel_id', 'vessel',
         'vsl_email', 'surname', 'full_name', 'rank',
         'sign_on_date', 'due_date'
     ])
-    mock_read_sql.return_value = empty_df
-
-    # Create SQL query file
-    sql_file = mock_config.queries_dir / 'MastersNavigationAudit.sql'
-    sql_file.write_text('SELECT * FROM crew_contracts;')
+    _serve_frame(monkeypatch, empty_df)
 
-    # Initialize
-    mock_config.tracker = mock_event_tracker
-    mock_email_sender = MagicMock()
-    mock_config.email_sender = mock_email_sender
-    mock_config.html_formatter = MagicMock()
-    mock_config.text_formatter = MagicMock()
+    alert, mock_email_sender = configured_alert
 
     # Run alert
-    alert = MastersNavigationAuditAlert(mock_config)
     result = alert.run()
 
     # Should complete successfully without sending emails
@@ -654,50 +518,27 @@ def test_alert_handles_empty_results(mock_read_sql, mock_get_db, mock_config, mo
     assert mock_email_sender.send.call_count == 0
 
 
-@patch('src.alerts.masters_navigation_audit.get_db_connection')
-@patch('src.alerts.masters_navigation_audit.pd.read_sql_query')
-def test_alert_with_multiple_jobs_per_vessel(mock_read_sql, mock_get_db, mock_config, mock_event_tracker, temp_dir):
+@pytest.mark.slow
+def test_alert_with_multiple_jobs_per_vessel(configured_alert, mock_event_tracker, df_factory, monkeypatch):
     """Test alert correctly groups multiple jobs for the same vessel."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
-    # Mock get_db_connection
-    mock_conn = MagicMock()
-    mock_get_db.return_value.__enter__.return_value = mock_conn
-    mock_get_db.return_value.__exit__.return_value = None
-
     # Create DataFrame with multiple jobs for same vessel
-    multi_job_df = pd.DataFrame({
-        'crew_contract_id': [48941, 48942, 48943],
-        'crew_member_id': [123, 456, 789],
-        'vessel_id': [1, 1, 1],
-        'vsl_email': ['lia@vsl.prominencemaritime.com', 'lia@vsl.prominencemaritime.com', 'lia@vsl.prominencemaritime.com'],
-        'vessel': ['LIA', 'LIA', 'LIA'],
-        'surname': ['White', 'Mustard', 'Scarlet'],
-        'full_name': ['Mrs White', 'Colonel Mustard', 'Miss Scarlet'],
-        'rank': ['Captain', 'Captain', 'Captain'],
-        'sign_on_date': [datetime.now() - timedelta(hours=6)] * 3,
-        'due_date': [(datetime.now() - timedelta(hours=6) + timedelta(days=14)).date()] * 3
-    })
-
-    mock_read_sql.return_value = multi_job_df
-
-    # Create SQL query file
-    sql_file = mock_config.queries_dir / 'MastersNavigationAudit.sql'
-    sql_file.write_text('SELECT * FROM crew_contracts;')
+    multi_job_df = df_factory(
+        n=3,
+        sign_on_offset=timedelta(hours=6),
+        crew_contract_id=[48941, 48942, 48943],
+        crew_member_id=[123, 456, 789],
+        vessel_id=1,
+        vsl_email='lia@vsl.prominencemaritime.com',
+        vessel='LIA',
+        surname=['White', 'Mustard', 'Scarlet'],
+        full_name=['Mrs White', 'Colonel Mustard', 'Miss Scarlet'],
+    )
 
-    # Initialize
-    mock_config.tracker = mock_event_tracker
-    mock_email_sender = MagicMock()
-    mock_config.email_sender = mock_email_sender
-    mock_config.html_formatter = MagicMock()
-    mock_config.text_formatter = MagicMock()
+    _serve_frame(monkeypatch, multi_job_df)
 
-    # Mock formatters
-    mock_config.html_formatter.format.return_value = '<html>Test</html>'
-    mock_config.text_formatter.format.return_value = 'Test'
+    alert, mock_email_sender = configured_alert
 
     # Run alert
-    alert = MastersNavigationAuditAlert(mock_config)
     alert.run()
 
     # Should send only 1 email (all jobs for LIA grouped together)
@@ -707,93 +548,12 @@ def test_alert_with_multiple_jobs_per_vessel(mock_read_sql, mock_get_db, mock_co
     assert len(mock_event_tracker.sent_events) == 3
 
 
-@patch('src.alerts.masters_navigation_audit.get_db_connection')
-@patch('src.alerts.masters_navigation_audit.pd.read_sql_query')
-def test_alert_respects_lookback_days(mock_read_sql, mock_get_db, mock_config, mock_event_tracker, temp_dir):
-    """Test that alert correctly filters by lookback_days."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
-    # Mock get_db_connection
-    mock_conn = MagicMock()
-    mock_get_db.return_value.__enter__.return_value = mock_conn
-    mock_get_db.return_value.__exit__.return_value = None
-
-    # Create DataFrame with captains at different sign-on ages
-    mixed_age_df = pd.DataFrame({
-        'crew_contract_id': [101, 102, 103],
-        'crew_member_id': [201, 202, 203],
-        'vessel_id': [1, 2, 3],
-        'vessel': ['VESSEL1', 'VESSEL2', 'VESSEL3'],
-        'vsl_email': ['v1@test.com', 'v2@test.com', 'v3@test.com'],
-        'surname': ['Recent', 'Old', 'VeryOld'],
-        'full_name': ['Recent Captain', 'Old Captain', 'Very Old Captain'],
-        'rank': ['Captain', 'Captain', 'Captain'],
-        'sign_on_date': [
-            datetime.now() - timedelta(hours=2),    # Recent (within 1 day)
-            datetime.now() - timedelta(days=3),     # Old (outside 1 day)
-            datetime.now() - timedelta(days=10)     # Very old (outside 1 day)
-        ],
-        'due_date': [
-            (datetime.now() - timedelta(hours=2) + timedelta(days=14)).date(),
-            (datetime.now() - timedelta(days=3) + timedelta(days=14)).date(),
-            (datetime.now() - timedelta(days=10) + timedelta(days=14)).date()
-        ]
-    })
-
-    mock_read_sql.return_value = mixed_age_df
-
-    # Create SQL query file
-    sql_file = mock_config.queries_dir / 'MastersNavigationAudit.sql'
-    sql_file.write_text('SELECT * FROM crew_contracts;')
-
-    # Initialize with lookback_days=1
-    mock_config.lookback_days = 1
-    mock_config.tracker = mock_event_tracker
-    mock_email_sender = MagicMock()
-    mock_config.email_sender = mock_email_sender
-    mock_config.html_formatter = MagicMock()
-    mock_config.text_formatter = MagicMock()
-
-    # Mock formatters
-    mock_config.html_formatter.format.return_value = '<html>Test</html>'
-    mock_config.text_formatter.format.return_value = 'Test'
-
-    # Run alert
-    alert = MastersNavigationAuditAlert(mock_config)
-    alert.run()
-
-    # Should only send 1 email (only the recent job within 1 day)
-    assert mock_email_sender.send.call_count == 1
-
-    # Should only track 1 job (the recent one)
-    assert len(mock_event_tracker.sent_events) == 1
-
-
-@patch('src.alerts.masters_navigation_audit.get_db_connection')
-@patch('src.alerts.masters_navigation_audit.pd.read_sql_query')
-def test_alert_includes_urls_when_enabled(mock_read_sql, mock_get_db, mock_config, sample_dataframe, mock_event_tracker, temp_dir):
+def test_alert_includes_urls_when_enabled(alert, mock_config, sample_dataframe, mock_event_tracker, temp_dir, monkeypatch):
     """Test that URLs are added to job data when links are enabled."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
-    # Mock get_db_connection
-    mock_conn = MagicMock()
-    mock_get_db.return_value.__enter__.return_value = mock_conn
-    mock_get_db.return_value.__exit__.return_value = None
-
-    # Mock pd.read_sql_query
-    mock_read_sql.return_value = sample_dataframe
-
-    # Create SQL query file
-    sql_file = mock_config.queries_dir / 'MastersNavigationAudit.sql'
-    sql_file.write_text('SELECT * FROM crew_contracts;')
-
     # Enable links
-    mock_config.enable_links = True
-    mock_config.base_url = 'https://prominence.orca.tools'
-    mock_config.url_path = '/events'
-
-    # Initialize
-    alert = MastersNavigationAuditAlert(mock_config)
+    monkeypatch.setattr(mock_config, 'enable_links', True)
+    monkeypatch.setattr(mock_config, 'base_url', 'https://prominence.orca.tools')
+    monkeypatch.setattr(mock_config, 'url_path', '/events')
 
     # Route notifications (don't need full run)
     jobs = alert.route_notifications(sample_dataframe)
@@ -802,51 +562,28 @@ def test_alert_includes_urls_when_enabled(mock_read_sql, mock_get_db, mock_confi
     for job in jobs:
         assert 'url' in job['data'].columns
         # Verify URLs are properly formatted
-        for url in job['data']['url']:
-            assert url.startswith('https://prominence.orca.tools/events/')
-            assert url.split('/')[-1].isdigit()  # Should end with crew_contract_id
+        urls = job['data']['url']
+        assert urls.str.startswith('https://prominence.orca.tools/events/').all()
+        assert urls.str.rsplit('/', n=1).str[-1].str.isdigit().all()  # Should end with crew_contract_id
 
 
-@patch('src.alerts.masters_navigation_audit.get_db_connection')
-@patch('src.alerts.masters_navigation_audit.pd.read_sql_query')
-def test_alert_metadata_includes_vessel_info(mock_read_sql, mock_get_db, mock_config, sample_dataframe, mock_event_tracker, temp_dir):
+def test_alert_metadata_includes_vessel_info(alert, sample_dataframe):
     """Test that metadata includes correct vessel information."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
-    # Mock get_db_connection
-    mock_conn = MagicMock()
-    mock_get_db.return_value.__enter__.return_value = mock_conn
-    mock_get_db.return_value.__exit__.return_value = None
+    # Route notifications
+    jobs = alert.route_notifications(sample_dataframe)
 
-    # Mock pd.read_sql_query
-    mock_read_sql.return_value = sample_dataframe
+    # Check metadata across all jobs at once
+    metas = [job['metadata'] for job in jobs]
+    required = {'vessel_id', 'vessel_name', 'alert_title', 'company_name', 'display_columns'}
 
-    # Create SQL query file
-    sql_file = mock_config.queries_dir / 'MastersNavigationAudit.sql'
-    sql_file.write_text('SELECT * FROM crew_contracts;')
+    # Should have all required metadata fields
+    assert all(required <= set(m) for m in metas)
 
-    # Initialize
-    alert = MastersNavigationAuditAlert(mock_config)
+    # Alert title should be correct
+    assert {m['alert_title'] for m in metas} == {"Master's NAV Audit & MLC Inspection"}
 
-    # Route notifications
-    jobs = alert.route_notifications(sample_dataframe)
+    # One job per vessel in the sample data
+    assert {m['vessel_name'] for m in metas} == {'VESSEL', 'OTHER VESSEL'}
 
-    # Check metadata for each job
-    for job in jobs:
-        metadata = job['metadata']
-        
-        # Should have all required metadata fields
-        assert 'vessel_id' in metadata
-        assert 'vessel_name' in metadata
-        assert 'alert_title' in metadata
-        assert 'company_name' in metadata
-        assert 'display_columns' in metadata
-        
-        # Alert title should be correct
-        assert metadata['alert_title'] == "Master's NAV Audit & MLC Inspection"
-        
-        # Vessel name should match one from sample data
-        assert metadata['vessel_name'] in ['VESSEL', 'OTHER VESSEL']
-        
-        # Company name should be set based on domain
-        assert metadata['company_name'] in ['Prominence Maritime S.A.', 'Sea Traders S.A.']
+    # Company name should be set based on domain
+    assert {m['company_name'] for m in metas} <= {'Prominence Maritime S.A.', 'Sea Traders S.A.'}
@@ -2,28 +2,76 @@
 """
 Tests for MastersNavigationAuditAlert logic.
 """
+import re
+import functools
 import pytest
+from collections import Counter
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from unittest.mock import patch, MagicMock
+from datetime import timedelta
 
+from tests.helpers import NOW
 
-def test_alert_initializes_correctly(mock_config):
+
+pytestmark = pytest.mark.usefixtures('frozen_time')
+
+
+DATETIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+# One Masters Navigation Audit row; tests vary it with .assign()
+_TEMPLATE = pd.DataFrame({
+    'crew_contract_id': np.array([101], dtype=np.int64),
+    'crew_member_id': np.array([201], dtype=np.int64),
+    'vessel_id': np.array([123], dtype=np.int64),
+    'vessel': ['TEST VESSEL'],
+    'vsl_email': ['test@prominencemaritime.com'],
+    'surname': ['Smith'],
+    'full_name': ['John Smith'],
+    'rank': ['Captain'],
+    'sign_on_date': np.array([NOW - timedelta(days=1)], dtype='datetime64[s]'),
+    'due_date': np.array([(NOW + timedelta(days=13)).date()], dtype=object),  # as read_sql returns DATE
+})
+
+@functools.lru_cache(maxsize=16)
+def _one_row_df(email, vessel_id=123, vessel_name='TEST VESSEL'):
+    """_TEMPLATE for one vessel, memoised; callers must treat it as read-only."""
+    return _TEMPLATE.assign(vsl_email=email, vessel_id=vessel_id, vessel=vessel_name)
+
+
+# Domain CC recipients from conftest.py, keyed by the vessel email's domain label
+EXPECTED_CC = {
+    'prominencemaritime': {'prom1@test.com', 'prom2@test.com'},
+    'seatraders': {'sea1@test.com', 'sea2@test.com'},
+}
+
+# (vessel email, domain CC recipients)
+DOMAIN_CASES = [
+    ('vessel@prominencemaritime.com', {'prom1@test.com', 'prom2@test.com'}),
+    ('vessel@vsl.seatraders.com', {'sea1@test.com', 'sea2@test.com'}),
+    ('vessel@unknown.com', set()),
+]
+
+# (vessel email, company name)
+COMPANY_CASES = [
+    ('vessel@prominencemaritime.com', 'Prominence Maritime S.A.'),
+    ('vessel@vsl.prominencemaritime.com', 'Prominence Maritime S.A.'),
+    ('vessel@seatraders.com', 'Sea Traders S.A.'),
+    ('vessel@vsl.seatraders.com', 'Sea Traders S.A.'),
+    ('vessel@unknown.com', 'Prominence Maritime S.A.'),
+]
+
+
+def test_alert_initializes_correctly(alert, mock_config):
     """Test that alert initializes with correct configuration."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
     assert alert.sql_query_file == 'MastersNavigationAudit.sql'
     assert alert.lookback_days == mock_config.lookback_days
     assert alert.rank_id == mock_config.rank_id
 
 
-def test_alert_filters_data_by_lookback_days(mock_config, sample_dataframe):
+def test_alert_filters_data_by_lookback_days(alert, sample_dataframe):
     """Test that filter_data correctly filters by lookback days."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     alert.lookback_days = 1  # Last 24 hours
     
     # Sample data has captains who signed on at different times
@@ -34,24 +82,23 @@ def test_alert_filters_data_by_lookback_days(mock_config, sample_dataframe):
     assert len(filtered) == 3
 
 
-def test_alert_filters_out_old_data(mock_config, sample_dataframe):
+def test_alert_filters_out_old_data(alert, sample_dataframe):
     """Test that old data is filtered out."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    # Create old record by copying a row and modifying it
-    old_record = sample_dataframe.iloc[[0]].copy()
-    old_record['crew_contract_id'] = 999
-    old_record['crew_member_id'] = 999
-    old_record['vessel_id'] = 999
-    old_record['vessel'] = 'OLD VESSEL'
-    old_record['vsl_email'] = 'old@test.com'
-    old_record['surname'] = 'Old'
-    old_record['full_name'] = 'Old Captain'
-    old_record['sign_on_date'] = datetime.now() - timedelta(days=5)
-    
+    # One-row frame with the sample's dtypes, appended in a single concat
+    old_sign_on = NOW - timedelta(days=5)
+    old_record = _TEMPLATE.assign(
+        crew_contract_id=999,
+        crew_member_id=999,
+        vessel_id=999,
+        vessel='OLD VESSEL',
+        vsl_email='old@test.com',
+        surname='Old',
+        full_name='Old Captain',
+        sign_on_date=np.datetime64(old_sign_on, 's'),
+        due_date=np.datetime64(old_sign_on + timedelta(days=14), 'D'),
+    )
     df_with_old = pd.concat([sample_dataframe, old_record], ignore_index=True)
     
-    alert = MastersNavigationAuditAlert(mock_config)
     alert.lookback_days = 1
     
     filtered = alert.filter_data(df_with_old)
@@ -61,11 +108,8 @@ def test_alert_filters_out_old_data(mock_config, sample_dataframe):
     assert 999 not in filtered['crew_contract_id'].values
 
 
-def test_alert_routes_by_vessel(mock_config, sample_dataframe):
+def test_alert_routes_by_vessel(alert, sample_dataframe):
     """Test that notifications are routed correctly by vessel."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
     
     # Should create 2 jobs (VESSEL with 2 captains, OTHER VESSEL with 2 captains)
@@ -77,111 +121,44 @@ def test_alert_routes_by_vessel(mock_config, sample_dataframe):
     assert vessel_job['recipients'] == ['test@prominencemaritime.com']
 
 
-def test_alert_assigns_correct_cc_recipients(mock_config, sample_dataframe):
+def test_alert_assigns_correct_cc_recipients(alert, sample_dataframe):
     """Test that CC recipients are assigned based on email domain plus internal recipients."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
 
     # Check each job's CC recipients
     for job in jobs:
-        cc_recipients = job['cc_recipients']
-        
-        if 'prominencemaritime' in job['recipients'][0]:
-            # Should include Prominence CC recipients
-            assert 'prom1@test.com' in cc_recipients
-            assert 'prom2@test.com' in cc_recipients
-        elif 'seatraders' in job['recipients'][0]:
-            # Should include Seatraders CC recipients
-            assert 'sea1@test.com' in cc_recipients
-            assert 'sea2@test.com' in cc_recipients
-        
+        cc_recipients = set(job['cc_recipients'])
+        domain = job['recipients'][0].split('@', 1)[1].split('.', 1)[0]
+
+        # Should include the domain's CC recipients
+        assert EXPECTED_CC.get(domain, set()) <= cc_recipients
+
         # Should ALSO include internal recipients (from conftest.py)
         assert 'internal@test.com' in cc_recipients
 
 
-def test_alert_prominence_domain_gets_prominence_cc(mock_config):
-    """Test that Prominence domain gets Prominence CC recipients."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    # Create test dataframe with Prominence vessel
-    test_df = pd.DataFrame({
-        'crew_contract_id': [101],
-        'crew_member_id': [201],
-        'vessel_id': [123],
-        'vessel': ['TEST VESSEL'],
-        'vsl_email': ['test@prominencemaritime.com'],
-        'surname': ['Smith'],
-        'full_name': ['John Smith'],
-        'rank': ['Captain'],
-        'sign_on_date': [datetime.now() - timedelta(days=1)],
-        'due_date': [(datetime.now() - timedelta(days=1) + timedelta(days=14)).date()],
-    })
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    jobs = alert.route_notifications(test_df)
-    
-    assert len(jobs) == 1
-    cc_recipients = jobs[0]['cc_recipients']
-    
-    # Should include Prominence CC recipients
-    assert 'prom1@test.com' in cc_recipients
-    assert 'prom2@test.com' in cc_recipients
-
+@pytest.mark.parametrize("email,expected_cc", DOMAIN_CASES)
+def test_alert_domain_gets_domain_cc(alert, email, expected_cc):
+    """Test that each vessel domain gets its own CC recipients plus internal ones."""
+    jobs = alert.route_notifications(_one_row_df(email))
 
-def test_alert_seatraders_domain_gets_seatraders_cc(mock_config):
-    """Test that Seatraders domain gets Seatraders CC recipients."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    # Create test dataframe with Seatraders vessel
-    test_df = pd.DataFrame({
-        'crew_contract_id': [101],
-        'crew_member_id': [201],
-        'vessel_id': [789],
-        'vessel': ['SEA VESSEL'],
-        'vsl_email': ['test@seatraders.com'],
-        'surname': ['Jones'],
-        'full_name': ['Jane Jones'],
-        'rank': ['Captain'],
-        'sign_on_date': [datetime.now() - timedelta(days=1)],
-        'due_date': [(datetime.now() - timedelta(days=1) + timedelta(days=14)).date()],
-    })
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    jobs = alert.route_notifications(test_df)
-    
     assert len(jobs) == 1
-    cc_recipients = jobs[0]['cc_recipients']
-    
-    # Should include Seatraders CC recipients
-    assert 'sea1@test.com' in cc_recipients
-    assert 'sea2@test.com' in cc_recipients
+    assert set(jobs[0]['cc_recipients']) == expected_cc | {'internal@test.com'}
 
 
-def test_alert_generates_correct_subject_lines(mock_config, sample_dataframe):
+def test_alert_generates_correct_subject_lines(alert, sample_df_head1, sample_df_head3):
     """Test subject line generation."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
     # Single record
-    single_df = sample_dataframe.iloc[:1]
-    subject_single = alert.get_subject_line(single_df, {'vessel': 'VESSEL'})
+    subject_single = alert.get_subject_line(sample_df_head1, {'vessel': 'VESSEL'})
     assert subject_single == "AlertDev | VESSEL Master's NAV Audit & MLC Inspection"
     
     # Multiple records (same subject format regardless of count)
-    multi_df = sample_dataframe.iloc[:3]
-    subject_multi = alert.get_subject_line(multi_df, {'vessel': 'VESSEL'})
+    subject_multi = alert.get_subject_line(sample_df_head3, {'vessel': 'VESSEL'})
     assert subject_multi == "AlertDev | VESSEL Master's NAV Audit & MLC Inspection"
 
 
-def test_alert_generates_correct_tracking_keys(mock_config, sample_dataframe):
+def test_alert_generates_correct_tracking_keys(alert, sample_dataframe):
     """Test that tracking keys are generated correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
     row = sample_dataframe.iloc[0]
     key = alert.get_tracking_key(row)
     
@@ -194,11 +171,8 @@ def test_alert_generates_correct_tracking_keys(mock_config, sample_dataframe):
     assert '__' in key  # Double underscore separator
 
 
-def test_alert_required_columns_validation(mock_config):
+def test_alert_required_columns_validation(alert):
     """Test that required columns are correctly defined."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     required = alert.get_required_columns()
     
     # Masters Navigation Audit schema
@@ -214,12 +188,8 @@ def test_alert_required_columns_validation(mock_config):
     assert 'due_date' in required
 
 
-def test_alert_validates_dataframe_columns(mock_config, sample_dataframe):
+def test_alert_validates_dataframe_columns(alert, sample_dataframe):
     """Test that DataFrame validation works correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
     # Should not raise exception with valid DataFrame
     alert.validate_required_columns(sample_dataframe)
     
@@ -229,14 +199,11 @@ def test_alert_validates_dataframe_columns(mock_config, sample_dataframe):
         alert.validate_required_columns(invalid_df)
 
 
-def test_alert_includes_internal_recipients_in_cc(mock_config, sample_dataframe):
+def test_alert_includes_internal_recipients_in_cc(alert, mock_config, sample_dataframe, monkeypatch):
     """Test that internal recipients are always included in CC."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
     # Set up internal recipients
-    mock_config.internal_recipients = ['admin@company.com', 'manager@company.com']
+    monkeypatch.setattr(mock_config, 'internal_recipients', ['admin@company.com', 'manager@company.com'])
 
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
 
     # Check all jobs include internal recipients in CC
@@ -250,28 +217,20 @@ def test_alert_includes_internal_recipients_in_cc(mock_config, sample_dataframe)
             f"Internal recipient 'manager@company.com' missing from CC: {cc_recipients}"
 
 
-def test_alert_internal_recipients_when_no_domain_match(mock_config):
+def test_alert_internal_recipients_when_no_domain_match(alert, mock_config, monkeypatch):
     """Test that internal recipients are used when domain doesn't match routing."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
     # Create dataframe with unknown domain
-    unknown_domain_df = pd.DataFrame({
-        'crew_contract_id': [101],
-        'crew_member_id': [201],
-        'vessel_id': [999],
-        'vessel': ['UNKNOWN VESSEL'],
-        'vsl_email': ['unknown@unknowndomain.com'],  # Not in routing
-        'surname': ['Unknown'],
-        'full_name': ['Captain Unknown'],
-        'rank': ['Captain'],
-        'sign_on_date': [datetime.now() - timedelta(days=1)],
-        'due_date': [(datetime.now() - timedelta(days=1) + timedelta(days=14)).date()],
-    })
+    unknown_domain_df = _TEMPLATE.assign(
+        vessel_id=999,
+        vessel='UNKNOWN VESSEL',
+        vsl_email='unknown@unknowndomain.com',  # Not in routing
+        surname='Unknown',
+        full_name='Captain Unknown',
+    )
 
     # Set up internal recipients
-    mock_config.internal_recipients = ['admin@company.com', 'manager@company.com']
+    monkeypatch.setattr(mock_config, 'internal_recipients', ['admin@company.com', 'manager@company.com'])
 
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(unknown_domain_df)
 
     # Should have one job
@@ -284,35 +243,25 @@ def test_alert_internal_recipients_when_no_domain_match(mock_config):
     assert len(cc_recipients) == 2  # Only internal, no domain-specific
 
 
-def test_alert_deduplicates_cc_recipients(mock_config, sample_dataframe):
+def test_alert_deduplicates_cc_recipients(alert, mock_config, sample_dataframe, monkeypatch):
     """Test that duplicate emails in CC list are removed."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
     # Set internal recipients to overlap with domain CC (prom1@test.com)
-    mock_config.internal_recipients = ['prom1@test.com', 'admin@company.com']
+    monkeypatch.setattr(mock_config, 'internal_recipients', ['prom1@test.com', 'admin@company.com'])
 
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
 
     # Check that duplicates are removed
     for job in jobs:
         cc_recipients = job['cc_recipients']
 
-        # Should not have duplicates
-        assert len(cc_recipients) == len(set(cc_recipients)), \
-            f"Duplicate emails found in CC list: {cc_recipients}"
-
-        # If prom1@test.com is in the list, it should appear only once
-        if 'prom1@test.com' in cc_recipients:
-            assert cc_recipients.count('prom1@test.com') == 1
+        # Should not have duplicates (covers the overlapping prom1@test.com too)
+        most_common = Counter(cc_recipients).most_common(1)
+        assert not most_common or most_common[0][1] == 1, \
+            f"Duplicate emails found in CC list: {most_common}"
 
 
-def test_alert_format_date_column(mock_config):
+def test_alert_format_date_column(alert):
     """Test that _format_date_column formats dates correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-
-    alert = MastersNavigationAuditAlert(mock_config)
-
     # Create test dataframe with various date formats
     test_df = pd.DataFrame({
         'test_date': [
@@ -332,44 +281,33 @@ def test_alert_format_date_column(mock_config):
     assert test_df['test_date'].iloc[3] == ''  # NaT becomes empty string
 
 
-def test_alert_get_url_links_when_enabled(mock_config):
+def test_alert_get_url_links_when_enabled(alert, mock_config, monkeypatch):
     """Test URL generation when links are enabled."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    mock_config.enable_links = True
-    mock_config.base_url = 'https://prominence.orca.tools'
-    mock_config.url_path = '/events'
-    
-    alert = MastersNavigationAuditAlert(mock_config)
+    monkeypatch.setattr(mock_config, 'enable_links', True)
+    monkeypatch.setattr(mock_config, 'base_url', 'https://prominence.orca.tools')
+    monkeypatch.setattr(mock_config, 'url_path', '/events')
     
     url = alert._get_url_links(12345)
     
     assert url == 'https://prominence.orca.tools/events/12345'
 
 
-def test_alert_get_url_links_when_disabled(mock_config):
+def test_alert_get_url_links_when_disabled(alert, mock_config, monkeypatch):
     """Test URL generation when links are disabled."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    mock_config.enable_links = False
-    
-    alert = MastersNavigationAuditAlert(mock_config)
+    monkeypatch.setattr(mock_config, 'enable_links', False)
     
     url = alert._get_url_links(12345)
     
     assert url is None
 
 
-def test_alert_url_links_added_to_dataframe(mock_config, sample_dataframe):
+def test_alert_url_links_added_to_dataframe(alert, mock_config, sample_dataframe, monkeypatch):
     """Test that URL links are added to dataframe when enabled."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
     # Enable links for this test
-    mock_config.enable_links = True
-    mock_config.base_url = 'https://prominence.orca.tools'
-    mock_config.url_path = '/events'
+    monkeypatch.setattr(mock_config, 'enable_links', True)
+    monkeypatch.setattr(mock_config, 'base_url', 'https://prominence.orca.tools')
+    monkeypatch.setattr(mock_config, 'url_path', '/events')
     
-    alert = MastersNavigationAuditAlert(mock_config)
     jobs = alert.route_notifications(sample_dataframe)
     
     # Check that jobs have URL column
@@ -379,80 +317,57 @@ def test_alert_url_links_added_to_dataframe(mock_config, sample_dataframe):
         assert job['data']['url'].notna().all()
 
 
-def test_alert_display_columns_specified(mock_config, sample_dataframe):
-    """Test that display_columns are specified in metadata."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
+def test_alert_url_column_matches_get_url_links(alert, mock_config, sample_dataframe, monkeypatch):
+    """Test that vectorised URL column matches per-id _get_url_links output."""
+    monkeypatch.setattr(mock_config, 'enable_links', True)
+    monkeypatch.setattr(mock_config, 'base_url', 'https://prominence.orca.tools/')
+    monkeypatch.setattr(mock_config, 'url_path', '/events/')
     
-    alert = MastersNavigationAuditAlert(mock_config)
-    jobs = alert.route_notifications(sample_dataframe)
-    
-    expected_display_columns = [
-        'full_name',
-        'rank',
-        'sign_on_date',
-        'due_date'
-    ]
+    urls = alert._get_url_column(sample_dataframe['crew_contract_id'])
     
-    for job in jobs:
-        assert 'display_columns' in job['metadata']
-        assert job['metadata']['display_columns'] == expected_display_columns
+    expected = [alert._get_url_links(i) for i in sample_dataframe['crew_contract_id']]
+    assert list(urls) == expected
+    assert urls.index.equals(sample_dataframe.index)
 
 
-def test_alert_get_company_name_prominence(mock_config):
-    """Test company name determination for Prominence."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
+def test_alert_route_notifications_leaves_input_untouched(alert, mock_config, sample_dataframe, monkeypatch):
+    """Test that adding the url column does not write back into the input DataFrame."""
+    monkeypatch.setattr(mock_config, 'enable_links', True)
+    original = sample_dataframe.copy()
     
-    company = alert._get_company_name('vessel@prominencemaritime.com')
-    assert company == 'Prominence Maritime S.A.'
+    jobs = alert.route_notifications(sample_dataframe)
     
-    company = alert._get_company_name('vessel@vsl.prominencemaritime.com')
-    assert company == 'Prominence Maritime S.A.'
+    assert all('url' in job['data'].columns for job in jobs)
+    assert 'url' not in sample_dataframe.columns
+    pd.testing.assert_frame_equal(sample_dataframe, original)
 
 
-def test_alert_get_company_name_seatraders(mock_config):
-    """Test company name determination for Seatraders."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
+def test_alert_display_columns_specified(alert, sample_dataframe):
+    """Test that display_columns are specified in metadata."""
+    jobs = alert.route_notifications(sample_dataframe)
     
-    company = alert._get_company_name('vessel@seatraders.com')
-    assert company == 'Sea Traders S.A.'
+    expected_display_columns = [
+        'full_name',
+        'rank',
+        'sign_on_date',
+        'due_date'
+    ]
     
-    company = alert._get_company_name('vessel@vsl.seatraders.com')
-    assert company == 'Sea Traders S.A.'
+    display_columns = [job['metadata'].get('display_columns') for job in jobs]
+    assert display_columns == [expected_display_columns] * len(jobs)
 
 
-def test_alert_get_company_name_default(mock_config):
-    """Test company name determination for unknown domain."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
-    
-    company = alert._get_company_name('vessel@unknown.com')
-    assert company == 'Prominence Maritime S.A.'  # Default
+@pytest.mark.parametrize("email,company", COMPANY_CASES)
+def test_alert_get_company_name(alert, email, company):
+    """Test company name determination by email domain, defaulting to Prominence."""
+    assert alert._get_company_name(email) == company
 
 
-def test_alert_filter_replaces_null_values(mock_config):
+def test_alert_filter_replaces_null_values(alert):
     """Test that filter_data handles null values correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
     # Create dataframe with null values
-    test_df = pd.DataFrame({
-        'crew_contract_id': [101],
-        'crew_member_id': [201],
-        'vessel_id': [123],
-        'vessel': ['TEST VESSEL'],
-        'vsl_email': ['test@test.com'],
-        'surname': [None],  # Null
-        'full_name': ['John Smith'],
-        'rank': [None],  # Null
-        'sign_on_date': [datetime.now() - timedelta(days=1)],
-        'due_date': [(datetime.now() - timedelta(days=1) + timedelta(days=14)).date()],
-    })
+    test_df = _TEMPLATE.assign(vsl_email='test@test.com', surname=None, rank=None)
     
-    alert = MastersNavigationAuditAlert(mock_config)
     filtered = alert.filter_data(test_df)
     
     # Nulls should be preserved or handled gracefully
@@ -460,26 +375,14 @@ def test_alert_filter_replaces_null_values(mock_config):
     assert len(filtered) > 0
 
 
-def test_alert_filter_formats_dates_correctly(mock_config, sample_dataframe):
+def test_alert_filter_formats_dates_correctly(alert, sample_dataframe):
     """Test that filter_data formats dates correctly."""
-    from src.alerts.masters_navigation_audit import MastersNavigationAuditAlert
-    
-    alert = MastersNavigationAuditAlert(mock_config)
     filtered = alert.filter_data(sample_dataframe)
     
-    # sign_on_date should be formatted as datetime string
-    for sign_on_date in filtered['sign_on_date']:
-        # Should match format: YYYY-MM-DD HH:MM:SS
-        assert len(sign_on_date) == 19
-        assert sign_on_date[4] == '-'
-        assert sign_on_date[7] == '-'
-        assert sign_on_date[10] == ' '
-        assert sign_on_date[13] == ':'
-        assert sign_on_date[16] == ':'
-    
-    # due_date should be formatted as date strings
-    for due_date in filtered['due_date']:
-        # Should match format: YYYY-MM-DD
-        assert len(due_date) == 10
-        assert due_date[4] == '-'
-        assert due_date[7] == '-'
+    assert not filtered.empty
+
+    # sign_on_date should be formatted as datetime string: YYYY-MM-DD HH:MM:SS
+    assert filtered['sign_on_date'].str.match(DATETIME_RE).all()
+
+    # due_date should be formatted as date string: YYYY-MM-DD
+    assert filtered['due_date'].str.match(DATE_RE).all()
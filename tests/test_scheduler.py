@@ -2,18 +2,68 @@
 """
 Tests for alert scheduler.
 """
+import re
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-import time
+from unittest.mock import Mock, MagicMock
 import signal
-from datetime import datetime, timedelta, time as dt_time
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
+
 from src.core.scheduler import AlertScheduler
 
 
-def test_scheduler_initializes_correctly():
+# duration_hours() trips numpy's generic-timedelta DeprecationWarning on every run loop
+# log line; ignore only that one so new deprecations in scheduler code still show up
+pytestmark = pytest.mark.filterwarnings("ignore:The 'generic' unit:DeprecationWarning")
+
+ATHENS = ZoneInfo('Europe/Athens')
+# Whole hours on the reference day (2025-12-03) used by the timing tests
+FIXED_TIMES = {h: datetime(2025, 12, 3, h, 0, 0, tzinfo=ATHENS) for h in (5, 6, 10, 12, 14, 15)}
+_SIGTERM = signal.SIGTERM
+_SIGINT = signal.SIGINT
+
+# Compiled once for pytest.raises(match=...)
+_NO_SCHEDULE_TIMES = re.compile(r"schedule_times must be set")
+_SCHEDULE_TIMES_REQUIRED = re.compile(r"schedule_times must be configured")
+_NO_TZ = re.compile(r"schedule_times_timezone must be configued")
+
+
+class CallCounter:
+    """Minimal stand-in for an alert runner that only counts its calls."""
+
+    __slots__ = ('n', 'side_effect')
+
+    def __init__(self, side_effect=None):
+        self.n = 0
+        self.side_effect = side_effect
+
+    def __call__(self, *args, **kwargs):
+        self.n += 1
+        if self.side_effect:
+            return self.side_effect()
+
+
+def _seq(*steps):
+    """Side effect replaying steps in order: exceptions are raised, callables called, None skipped."""
+    it = iter(steps)
+
+    def step(*args, **kwargs):
+        s = next(it)
+        if isinstance(s, BaseException):
+            raise s
+        return s() if s else None
+
+    return step
+
+
+def _err():
+    """Fresh error per raise; a reused instance would accumulate __traceback__ frames across tests."""
+    return RuntimeError("Test error")
+
+
+def test_scheduler_initializes_correctly(make_scheduler):
     """Test that scheduler initializes with correct parameters."""
-    scheduler = AlertScheduler(
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens'
     )
@@ -23,9 +73,9 @@ def test_scheduler_initializes_correctly():
     assert len(scheduler._alerts) == 0
 
 
-def test_scheduler_initializes_with_schedule_times():
+def test_scheduler_initializes_with_schedule_times(make_scheduler):
     """Test that scheduler initializes with schedule times."""
-    scheduler = AlertScheduler(
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens',
         schedule_times_timezone='Europe/Athens',
@@ -36,50 +86,42 @@ def test_scheduler_initializes_with_schedule_times():
     assert str(scheduler.schedule_times_timezone) == 'Europe/Athens'
 
 
-def test_scheduler_registers_alerts():
+def test_scheduler_registers_alerts(make_scheduler):
     """Test that alerts can be registered."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
-    
-    mock_alert = Mock()
-    scheduler.register_alert(mock_alert)
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
-    assert len(scheduler._alerts) == 1
+    assert scheduler.register_alert(CallCounter()) == 1
 
 
-def test_scheduler_registers_multiple_alerts():
+def test_scheduler_registers_multiple_alerts(make_scheduler):
     """Test that multiple alerts can be registered."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
-    
-    mock_alert1 = Mock()
-    mock_alert2 = Mock()
-    mock_alert3 = Mock()
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
-    scheduler.register_alert(mock_alert1)
-    scheduler.register_alert(mock_alert2)
-    scheduler.register_alert(mock_alert3)
+    scheduler.register_alert(CallCounter())
+    scheduler.register_alert(CallCounter())
     
-    assert len(scheduler._alerts) == 3
+    assert scheduler.register_alert(CallCounter()) == 3
 
 
-def test_scheduler_runs_once():
+def test_scheduler_runs_once(make_scheduler):
     """Test that run_once executes all alerts."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
-    mock_alert1 = Mock()
-    mock_alert2 = Mock()
+    alert1 = CallCounter()
+    alert2 = CallCounter()
     
-    scheduler.register_alert(mock_alert1)
-    scheduler.register_alert(mock_alert2)
+    scheduler.register_alert(alert1)
+    scheduler.register_alert(alert2)
     
     scheduler.run_once()
     
-    mock_alert1.assert_called_once()
-    mock_alert2.assert_called_once()
+    assert alert1.n == 1
+    assert alert2.n == 1
 
 
-def test_scheduler_run_once_with_no_alerts():
+def test_scheduler_run_once_with_no_alerts(make_scheduler):
     """Test that run_once handles no registered alerts gracefully."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
     # Should not raise exception
     scheduler.run_once()
@@ -87,11 +129,11 @@ def test_scheduler_run_once_with_no_alerts():
     assert len(scheduler._alerts) == 0
 
 
-def test_scheduler_handles_alert_failure():
+def test_scheduler_handles_alert_failure(make_scheduler):
     """Test that scheduler continues after alert failure."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
-    failing_alert = Mock(side_effect=Exception("Test error"))
+    failing_alert = Mock(side_effect=_err())
     successful_alert = Mock()
     
     scheduler.register_alert(failing_alert)
@@ -104,9 +146,9 @@ def test_scheduler_handles_alert_failure():
     successful_alert.assert_called_once()
 
 
-def test_scheduler_shutdown_signal():
+def test_scheduler_shutdown_signal(make_scheduler):
     """Test that scheduler responds to shutdown signal."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
     # Trigger shutdown
     scheduler.shutdown_event.set()
@@ -114,39 +156,47 @@ def test_scheduler_shutdown_signal():
     assert scheduler.shutdown_event.is_set()
 
 
-def test_scheduler_signal_handler():
+def test_scheduler_signal_handler(make_scheduler):
     """Test that signal handler sets shutdown event."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
     # Call signal handler directly
-    scheduler._signal_handler(signal.SIGTERM, None)
+    scheduler._signal_handler(_SIGTERM, None)
     
     assert scheduler.shutdown_event.is_set()
 
 
-def test_scheduler_signal_handler_sigint():
+def test_scheduler_signal_handler_sigint(make_scheduler):
     """Test that SIGINT handler sets shutdown event."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
     # Call signal handler with SIGINT
-    scheduler._signal_handler(signal.SIGINT, None)
-    
+    scheduler._signal_handler(_SIGINT, None)
+
     assert scheduler.shutdown_event.is_set()
 
 
-def test_scheduler_stops_alerts_on_shutdown():
+def test_scheduler_installs_signal_handlers_by_default():
+    """Test that the default constructor registers SIGTERM/SIGINT handlers."""
+    previous = {sig: signal.getsignal(sig) for sig in (_SIGTERM, _SIGINT)}
+    try:
+        scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+
+        assert signal.getsignal(_SIGTERM) == scheduler._signal_handler
+        assert signal.getsignal(_SIGINT) == scheduler._signal_handler
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+
+def test_scheduler_stops_alerts_on_shutdown(make_scheduler):
     """Test that scheduler stops running alerts when shutdown is triggered."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
-    
-    alert1 = Mock()
-    alert2 = Mock()
-    alert3 = Mock()
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
     # Set shutdown event after first alert
-    def trigger_shutdown():
-        scheduler.shutdown_event.set()
-    
-    alert1.side_effect = trigger_shutdown
+    alert1 = CallCounter(side_effect=scheduler.shutdown_event.set)
+    alert2 = CallCounter()
+    alert3 = CallCounter()
     
     scheduler.register_alert(alert1)
     scheduler.register_alert(alert2)
@@ -155,92 +205,63 @@ def test_scheduler_stops_alerts_on_shutdown():
     scheduler.run_once()
     
     # First alert should run (and trigger shutdown)
-    alert1.assert_called_once()
+    assert alert1.n == 1
     # Second and third should not run
-    alert2.assert_not_called()
-    alert3.assert_not_called()
-
+    assert alert2.n == 0
+    assert alert3.n == 0
 
-def test_calculate_next_run_time_later_today():
-    """Test calculating next run time when there's a scheduled time later today."""
-    scheduler = AlertScheduler(
-        frequency_hours=24,
-        timezone='Europe/Athens',
-        schedule_times_timezone='Europe/Athens',
-        schedule_times=['14:00', '18:00']
-    )
-    
-    # Current time is 10:00
-    current_time = datetime(2025, 12, 3, 10, 0, 0, tzinfo=ZoneInfo('Europe/Athens'))
-    
-    next_run = scheduler._calculate_next_run_time(current_time)
-    
-    # Should be 14:00 today
-    assert next_run.hour == 14
-    assert next_run.minute == 0
-    assert next_run.date() == current_time.date()
 
+# (schedule_times, current_time, expected next run)
+NEXT_RUN_CASES = [
+    # Later today
+    (['14:00', '18:00'], FIXED_TIMES[10], FIXED_TIMES[14]),
+    # No more runs today: first time tomorrow
+    (['12:00', '14:00'], FIXED_TIMES[15], FIXED_TIMES[12] + timedelta(days=1)),
+    # Unsorted: earliest time after current
+    (['18:00', '12:00', '06:00'], FIXED_TIMES[5], FIXED_TIMES[6]),
+]
 
-def test_calculate_next_run_time_tomorrow():
-    """Test calculating next run time when no more runs today."""
-    scheduler = AlertScheduler(
-        frequency_hours=24,
-        timezone='Europe/Athens',
-        schedule_times_timezone='Europe/Athens',
-        schedule_times=['12:00', '14:00']
-    )
-    
-    # Current time is 15:00 (after all scheduled times)
-    current_time = datetime(2025, 12, 3, 15, 0, 0, tzinfo=ZoneInfo('Europe/Athens'))
-    
-    next_run = scheduler._calculate_next_run_time(current_time)
-    
-    # Should be 12:00 tomorrow
-    assert next_run.hour == 12
-    assert next_run.minute == 0
-    assert next_run.date() == current_time.date() + timedelta(days=1)
 
+def test_calculate_next_run_time(make_scheduler):
+    """Test calculating the next run time from the configured schedule times."""
+    scheduler = make_scheduler()
 
-def test_calculate_next_run_time_sorts_schedule_times():
-    """Test that schedule times are sorted correctly."""
-    scheduler = AlertScheduler(
-        frequency_hours=24,
-        timezone='Europe/Athens',
-        schedule_times_timezone='Europe/Athens',
-        schedule_times=['18:00', '12:00', '06:00']  # Unsorted
-    )
-    
-    # Current time is 05:00
-    current_time = datetime(2025, 12, 3, 5, 0, 0, tzinfo=ZoneInfo('Europe/Athens'))
-    
-    next_run = scheduler._calculate_next_run_time(current_time)
-    
-    # Should be 06:00 (earliest time after current)
-    assert next_run.hour == 6
-    assert next_run.minute == 0
+    for schedule_times, current_time, expected in NEXT_RUN_CASES:
+        scheduler.schedule_times = schedule_times
+        assert scheduler._calculate_next_run_time(current_time) == expected, schedule_times
 
 
-def test_calculate_next_run_time_raises_without_schedule_times():
+def test_calculate_next_run_time_raises_without_schedule_times(make_scheduler):
     """Test that calculating next run time raises error without schedule_times."""
-    scheduler = AlertScheduler(
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens'
     )
     
-    current_time = datetime.now(tz=ZoneInfo('Europe/Athens'))
+    current_time = datetime.now(tz=ATHENS)
     
-    with pytest.raises(ValueError, match="schedule_times must be set"):
+    with pytest.raises(ValueError, match=_NO_SCHEDULE_TIMES):
         scheduler._calculate_next_run_time(current_time)
 
 
-@patch('src.core.scheduler.datetime')
-def test_run_continuous_executes_alerts(mock_datetime):
+@pytest.fixture(scope="module")
+def _frozen_datetime_mock():
+    """datetime stand-in whose now() returns a fixed time, built once per module."""
+    mock_datetime = MagicMock()
+    mock_datetime.now.return_value = FIXED_TIMES[12]
+    return mock_datetime
+
+
+@pytest.fixture
+def frozen_datetime(monkeypatch, _frozen_datetime_mock):
+    """Freeze src.core.scheduler.datetime for the duration of one test."""
+    monkeypatch.setattr('src.core.scheduler.datetime', _frozen_datetime_mock)
+    return _frozen_datetime_mock
+
+
+def test_run_continuous_executes_alerts(frozen_datetime, make_scheduler):
     """Test that run_continuous executes alerts."""
-    # Mock datetime.now to return consistent time
-    mock_now = datetime(2025, 12, 3, 12, 0, 0, tzinfo=ZoneInfo('Europe/Athens'))
-    mock_datetime.now.return_value = mock_now
-    
-    scheduler = AlertScheduler(frequency_hours=1, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=1, timezone='Europe/Athens')
     
     mock_alert = Mock()
     scheduler.register_alert(mock_alert)
@@ -257,44 +278,27 @@ def test_run_continuous_executes_alerts(mock_datetime):
     mock_alert.assert_called_once()
 
 
-@patch('src.core.scheduler.datetime')
-def test_run_continuous_sleeps_between_runs(mock_datetime):
+def test_run_continuous_sleeps_between_runs(frozen_datetime, make_scheduler):
     """Test that run_continuous sleeps between runs."""
-    mock_now = datetime(2025, 12, 3, 12, 0, 0, tzinfo=ZoneInfo('Europe/Athens'))
-    mock_datetime.now.return_value = mock_now
-    
-    scheduler = AlertScheduler(frequency_hours=2, timezone='Europe/Athens')
-    
-    mock_alert = Mock()
-    call_count = 0
+    # Mock wait to return immediately
+    mock_wait = Mock(return_value=False)
     
-    def increment_and_shutdown():
-        nonlocal call_count
-        call_count += 1
-        if call_count >= 2:
-            scheduler.shutdown_event.set()
+    scheduler = make_scheduler(frequency_hours=2, timezone='Europe/Athens', sleep_fn=mock_wait)
     
-    mock_alert.side_effect = increment_and_shutdown
+    # Second run requests shutdown
+    mock_alert = Mock(side_effect=_seq(None, scheduler.shutdown_event.set))
     scheduler.register_alert(mock_alert)
     
-    # Mock wait to return immediately
-    original_wait = scheduler.shutdown_event.wait
-    def mock_wait(timeout=None):
-        if call_count >= 2:
-            return True  # Shutdown
-        return False  # Continue
-    
-    scheduler.shutdown_event.wait = mock_wait
-    
     scheduler.run_continuous()
     
-    # Alert should have been called twice
-    assert call_count == 2
+    # Alert should have been called twice, with one sleep in between
+    assert mock_alert.call_count == 2
+    mock_wait.assert_called_once_with(timeout=2 * 3600)
 
 
-def test_run_continuous_handles_keyboard_interrupt():
+def test_run_continuous_handles_keyboard_interrupt(make_scheduler):
     """Test that run_continuous handles KeyboardInterrupt."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
     mock_alert = Mock(side_effect=KeyboardInterrupt())
     scheduler.register_alert(mock_alert)
@@ -305,58 +309,37 @@ def test_run_continuous_handles_keyboard_interrupt():
     mock_alert.assert_called_once()
 
 
-def test_run_continuous_recovers_from_errors():
+def test_run_continuous_recovers_from_errors(make_scheduler):
     """Test that run_continuous recovers from unhandled exceptions."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    # First wait is the error recovery (5 min wait), then shutdown
+    mock_wait = Mock(side_effect=[False, True])
     
-    call_count = 0
-    
-    def failing_alert():
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            raise RuntimeError("Test error")
-        else:
-            scheduler.shutdown_event.set()
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens', sleep_fn=mock_wait)
     
+    # Fails on the first run, requests shutdown on the second
+    failing_alert = Mock(side_effect=_seq(_err(), scheduler.shutdown_event.set))
     scheduler.register_alert(failing_alert)
     
-    # Mock wait to return immediately for first error recovery, then shutdown
-    original_wait = scheduler.shutdown_event.wait
-    wait_count = 0
-    
-    def mock_wait(timeout=None):
-        nonlocal wait_count
-        wait_count += 1
-        if wait_count == 1:
-            # First wait is the error recovery (5 min wait)
-            return False  # Continue
-        else:
-            # Second wait means we're past error recovery
-            return True  # Shutdown
-    
-    scheduler.shutdown_event.wait = mock_wait
-    
     scheduler.run_continuous()
     
     # Should have attempted to run twice (once failed, once succeeded)
-    assert call_count == 2
+    assert failing_alert.call_count == 2
 
 
-def test_run_at_times_raises_without_schedule_times():
+def test_run_at_times_raises_without_schedule_times(make_scheduler):
     """Test that run_at_times raises error without schedule_times."""
-    scheduler = AlertScheduler(
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens'
     )
     
-    with pytest.raises(ValueError, match="schedule_times must be configured"):
+    with pytest.raises(ValueError, match=_SCHEDULE_TIMES_REQUIRED):
         scheduler.run_at_times()
 
 
-def test_run_at_times_raises_without_schedule_times_timezone():
+def test_run_at_times_raises_without_schedule_times_timezone(make_scheduler):
     """Test that run_at_times raises error without schedule_times_timezone."""
-    scheduler = AlertScheduler(
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens',
         schedule_times=['12:00']
@@ -365,222 +348,128 @@ def test_run_at_times_raises_without_schedule_times_timezone():
     # Unset the timezone
     scheduler.schedule_times_timezone = None
     
-    with pytest.raises(ValueError, match="schedule_times_timezone must be configued"):
+    with pytest.raises(ValueError, match=_NO_TZ):
         scheduler.run_at_times()
 
 
-def test_run_at_times_executes_alerts():
+def test_run_at_times_executes_alerts(make_scheduler):
     """Test that run_at_times executes alerts at scheduled times."""
-    scheduler = AlertScheduler(
+    # Wait until the scheduled time and run alerts, then shutdown
+    mock_wait = Mock(side_effect=[False, True])
+    
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens',
         schedule_times_timezone='Europe/Athens',
-        schedule_times=['12:00']
+        schedule_times=['12:00'],
+        sleep_fn=mock_wait
     )
 
     mock_alert = Mock()
     scheduler.register_alert(mock_alert)
 
-    wait_count = 0
-
-    def mock_wait(timeout=None):
-        nonlocal wait_count
-        wait_count += 1
-        if wait_count == 1:
-            # First wait - simulate waiting until scheduled time
-            return False  # Don't shutdown, continue to run alerts
-        else:
-            # After running alerts, shutdown
-            return True
-
-    scheduler.shutdown_event.wait = mock_wait
-
     scheduler.run_at_times()
 
     # Alert should have been called once
     mock_alert.assert_called_once()
 
 
-def test_run_at_times_handles_keyboard_interrupt():
+def test_run_at_times_handles_keyboard_interrupt(make_scheduler):
     """Test that run_at_times handles KeyboardInterrupt."""
-    scheduler = AlertScheduler(
-        frequency_hours=24,
-        timezone='Europe/Athens',
-        schedule_times_timezone='Europe/Athens',
-        schedule_times=['12:00']
-    )
-    
     # Mock wait to raise KeyboardInterrupt
     def mock_wait(timeout=None):
         raise KeyboardInterrupt()
     
-    scheduler.shutdown_event.wait = mock_wait
-    
-    # Should not raise exception
-    scheduler.run_at_times()
-
-
-def test_run_at_times_recovers_from_errors():
-    """Test that run_at_times recovers from unhandled exceptions."""
-    scheduler = AlertScheduler(
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens',
         schedule_times_timezone='Europe/Athens',
-        schedule_times=['12:00']
+        schedule_times=['12:00'],
+        sleep_fn=mock_wait
     )
     
-    wait_count = 0
-    
-    def mock_wait(timeout=None):
-        nonlocal wait_count
-        wait_count += 1
-        if wait_count == 1:
-            # First wait - raise error
-            raise RuntimeError("Test error")
-        elif wait_count == 2:
-            # Second wait is error recovery (5 min)
-            return False
-        else:
-            # Third wait - shutdown
-            return True
-    
-    scheduler.shutdown_event.wait = mock_wait
-    
+    # Should not raise exception
     scheduler.run_at_times()
-    
-    # Should have waited at least twice (initial + error recovery)
-    assert wait_count >= 2
 
 
-def test_run_at_times_shutdown_during_sleep():
-    """Test that run_at_times respects shutdown during sleep."""
-    scheduler = AlertScheduler(
+def test_run_at_times_recovers_from_errors(make_scheduler):
+    """Test that run_at_times recovers from unhandled exceptions."""
+    # First wait raises, second is error recovery (5 min), third shuts down
+    mock_wait = Mock(side_effect=[_err(), False, True])
+    
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens',
         schedule_times_timezone='Europe/Athens',
-        schedule_times=['12:00']
+        schedule_times=['12:00'],
+        sleep_fn=mock_wait
     )
     
-    mock_alert = Mock()
-    scheduler.register_alert(mock_alert)
-    
-    # Mock wait to return True (shutdown requested)
-    def mock_wait(timeout=None):
-        return True  # Shutdown
-    
-    scheduler.shutdown_event.wait = mock_wait
-    
     scheduler.run_at_times()
     
-    # Alert should not have been called (shutdown during sleep)
-    mock_alert.assert_not_called()
+    # Should have waited at least twice (initial + error recovery)
+    assert mock_wait.call_count >= 2
 
 
-def test_run_at_times_shutdown_during_execution():
-    """Test that run_at_times respects shutdown during alert execution."""
-    scheduler = AlertScheduler(
+@pytest.mark.parametrize("wait_sequence, stop_in_alert, expected_calls, expected_waits", [
+    ([True], False, 0, 1),             # Shutdown during sleep
+    ([False, True], True, 1, 1),       # Shutdown during alert execution
+    ([_err, True], False, 0, 2),       # Shutdown during error recovery wait
+], ids=["sleep", "execution", "error_recovery"])
+def test_run_at_times_shutdown(make_scheduler, wait_sequence, stop_in_alert, expected_calls, expected_waits):
+    """Test that run_at_times respects shutdown requested at each stage."""
+    # Replay wait_sequence: _err builds an exception to raise, booleans are returned
+    mock_wait = Mock(side_effect=[w() if w is _err else w for w in wait_sequence])
+
+    scheduler = make_scheduler(
         frequency_hours=24,
         timezone='Europe/Athens',
         schedule_times_timezone='Europe/Athens',
-        schedule_times=['12:00']
+        schedule_times=['12:00'],
+        sleep_fn=mock_wait
     )
-    
-    mock_alert = Mock()
-    
-    def trigger_shutdown():
-        scheduler.shutdown_event.set()
-    
-    mock_alert.side_effect = trigger_shutdown
-    scheduler.register_alert(mock_alert)
-    
-    # Mock wait to return immediately first time
-    call_count = 0
-    def mock_wait(timeout=None):
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            return False  # Continue to run alerts
-        return True  # Shutdown after
-    
-    scheduler.shutdown_event.wait = mock_wait
-    
-    scheduler.run_at_times()
-    
-    # Alert should have been called once
-    mock_alert.assert_called_once()
 
+    alert = CallCounter(side_effect=scheduler.shutdown_event.set if stop_in_alert else None)
+    scheduler.register_alert(alert)
 
-def test_run_at_times_shutdown_during_error_recovery():
-    """Test that run_at_times respects shutdown during error recovery wait."""
-    scheduler = AlertScheduler(
-        frequency_hours=24,
-        timezone='Europe/Athens',
-        schedule_times_timezone='Europe/Athens',
-        schedule_times=['12:00']
-    )
-    
-    wait_count = 0
-    
-    def mock_wait(timeout=None):
-        nonlocal wait_count
-        wait_count += 1
-        if wait_count == 1:
-            # First wait - raise error to trigger error recovery
-            raise RuntimeError("Test error")
-        else:
-            # Second wait is error recovery - shutdown requested
-            return True
-    
-    scheduler.shutdown_event.wait = mock_wait
-    
     scheduler.run_at_times()
-    
-    # Should have waited twice (error + error recovery shutdown)
-    assert wait_count == 2
 
+    assert alert.n == expected_calls
+    assert mock_wait.call_count == expected_waits
 
-def test_run_continuous_shutdown_during_error_recovery():
+
+def test_run_continuous_shutdown_during_error_recovery(make_scheduler):
     """Test that run_continuous respects shutdown during error recovery wait."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
-    
-    mock_alert = Mock(side_effect=RuntimeError("Test error"))
-    scheduler.register_alert(mock_alert)
+    # Shutdown during error recovery
+    mock_wait = Mock(return_value=True)
     
-    wait_count = 0
-    
-    def mock_wait(timeout=None):
-        nonlocal wait_count
-        wait_count += 1
-        return True  # Shutdown during error recovery
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens', sleep_fn=mock_wait)
     
-    scheduler.shutdown_event.wait = mock_wait
+    mock_alert = Mock(side_effect=_err())
+    scheduler.register_alert(mock_alert)
     
     scheduler.run_continuous()
     
     # Should have called wait once (error recovery)
-    assert wait_count == 1
+    mock_wait.assert_called_once()
 
 
-def test_scheduler_logs_alert_name():
+def test_scheduler_logs_alert_name(make_scheduler):
     """Test that scheduler logs alert name when registering."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
     def named_alert():
         pass
     
     named_alert.__name__ = 'test_alert'
     
-    scheduler.register_alert(named_alert)
-    
-    assert len(scheduler._alerts) == 1
+    assert scheduler.register_alert(named_alert) == 1
 
 
-def test_scheduler_handles_anonymous_alert():
+def test_scheduler_handles_anonymous_alert(make_scheduler):
     """Test that scheduler handles alerts without __name__ attribute."""
-    scheduler = AlertScheduler(frequency_hours=24, timezone='Europe/Athens')
+    scheduler = make_scheduler(frequency_hours=24, timezone='Europe/Athens')
     
     mock_alert = Mock(spec=[])  # No __name__ attribute
     
-    scheduler.register_alert(mock_alert)
-    
-    assert len(scheduler._alerts) == 1
+    assert scheduler.register_alert(mock_alert) == 1